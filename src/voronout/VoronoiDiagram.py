@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from .Boundary import Boundary
 from .Point import Point
 
@@ -7,10 +9,18 @@ from .edges.VoronoiEdgeData import VoronoiEdgeData
 
 from .regions.VoronoiRegion import VoronoiRegion
 from .regions.VoronoiRegionData import VoronoiRegionData
+from .regions.VoronoiRegionIndex import VoronoiRegionIndex
+
+from .utils import boundValue
+from .utils.BasePointsPrepass import dedupeBasePoints, findCollinearGhostSites, mergeCocircularVertices
+from .utils.HaloSites import selectHaloSites, selectPeriodicHaloSites
+from .utils.RidgeClipping import clipRidgesToBox
 
+from copy import copy
 from enum import Enum
 
 from itertools import repeat
+from math import atan2
 
 from scipy.spatial import Voronoi
 from uuid import uuid4
@@ -25,21 +35,106 @@ class _BoundingNeeded(Enum):
 # Minimum basePoints that the underlying qHull requires.
 minBasePoints = 3
 
+# Coordinates are only kept to boundValue's 4 decimal places - np.float32 diagrams store them as int32 on that grid, which holds them exactly in float32's size.
+coordinateDtypes = tuple((np.float32, np.float64))
+
+# boundValue keeps 4 decimal places, so scaling unit-square coordinates by this makes every one an exact integer.
+_coordinateGridScale = 10000
+
 class VoronoiDiagram:
-    def __init__(self, basePoints: tuple[Point], planeWidth: float, planeHeight: float):
+    # prepareBasePoints merges basePoints that share a boundValue grid cell and works around collinear basePoints before running qhull - and, after, merges the vertices nearly cocircular basePoints give.
+    # previousDiagram, built from the same number of sites (e.g. the last frame of an animation), lends its site IDs - matched by index - and the IDs of any vertices that persist.
+    # window = (x0, y0, x1, y1), within (0, 0) -> (1, 1) like basePoints, builds only the cells inside it - from just the basePoints near enough to affect them.
+    # coordinateDtype is the precision of pointCoordinates()/vertexCoordinates(). np.float32 stores sites and vertices as int32 on boundValue's grid - half of float64, and exact -
+    # and doesn't keep points/vertices' Points, making them each time they're asked for. Clipping is still done in float64.
+    # periodic wraps the plane around - left edge to right, top to bottom - so regions continue across its edges instead of being bounded by them.
+    def __init__(self, basePoints: tuple[Point], planeWidth: float, planeHeight: float, prepareBasePoints: bool = False, previousDiagram: VoronoiDiagram | None = None, window: tuple[float, float, float, float] | None = None, coordinateDtype: type = np.float64, periodic: bool = False):
         # Make sure basePoints fits the minBasePoints/within (0, 0) -> (1, 1) constraints.
         self._validateBasePoints(basePoints = basePoints)
 
+        self._validateCoordinateDtype(coordinateDtype = coordinateDtype)
+        self.coordinateDtype = coordinateDtype
+
+        (siteBasePointIndices, mergedBasePointIndices) = dedupeBasePoints(basePoints = basePoints, periodic = periodic) if prepareBasePoints else (range(len(basePoints)), {})
+
+        # Wrapped around, a site at x = 1 (or y = 1) is the same as one at x = 0 (or y = 0) - two sites in one place give qhull no ridge between them.
+        if periodic and not prepareBasePoints and dedupeBasePoints(basePoints = basePoints, periodic = True)[1]:
+            raise ValueError("basePoints has points in the same place once the plane wraps around (e.g. at x = 0 and x = 1) - pass prepareBasePoints = True to merge them")
+        siteBasePoints = tuple((basePoints[siteBasePointIndex] for siteBasePointIndex in siteBasePointIndices))
+
+        if len(siteBasePoints) < minBasePoints:
+            raise ValueError(f"Too few distinct points specified, {siteBasePoints} - need minimum {minBasePoints}")
+
         # We expect basePoints to have 0, 0 (top-left), but scipy.spatial does 0, 0 (bottom-left) - so convert.
-        sciPySpatialPoints = np.array(tuple(basePoint.convertPointBase() for basePoint in basePoints))        
-        self._voronoiDiagram = Voronoi(sciPySpatialPoints)
+        sciPySpatialPoints = self._convertPointBases(points = siteBasePoints)
+
+        # windowBox is window converted the same way, as (minX, minY, maxX, maxY).
+        windowBox = self._makeWindowBox(window = window) if window else None
+
+        if windowBox:
+            if previousDiagram:
+                raise ValueError("previousDiagram matches sites by index, which a window doesn't keep")
+
+            if periodic:
+                raise ValueError("A periodic diagram has no edges for a window to be inside")
+
+            windowSiteIndices = selectHaloSites(sites = sciPySpatialPoints, box = windowBox, minSites = minBasePoints)
+            sciPySpatialPoints = sciPySpatialPoints[windowSiteIndices]
+
+            # mergedBasePointIndices point into siteBasePoints - re-point them at the window's sites.
+            windowSitePositions = { windowSiteIndex: windowSitePosition for (windowSitePosition, windowSiteIndex) in enumerate(windowSiteIndices.tolist()) }
+            mergedBasePointIndices = { mergedBasePointIndex: windowSitePositions[siteIndex] for (mergedBasePointIndex, siteIndex) in mergedBasePointIndices.items() if siteIndex in windowSitePositions }
+
+        # Ghost sites only exist to give qhull a non-degenerate input - they're never output.
+        ghostSites = findCollinearGhostSites(spatialPoints = sciPySpatialPoints) if prepareBasePoints and not periodic else None
+        self._numSites = len(sciPySpatialPoints)
+
+        # A periodic diagram's ghost sites are the sites' images just past the plane's edges (never collinear) - _siteOriginals/_siteShifts say which site, moved by how many planes.
+        if periodic:
+            (haloSiteIndices, haloShifts) = selectPeriodicHaloSites(sites = sciPySpatialPoints)
+            ghostSites = sciPySpatialPoints[haloSiteIndices] + haloShifts
+
+            self._siteOriginals = np.concatenate((np.arange(self._numSites), haloSiteIndices))
+            self._siteShifts = np.concatenate((np.zeros((self._numSites, 2), dtype = haloShifts.dtype), haloShifts))
+
+        if previousDiagram and len(previousDiagram.siteIds) != self._numSites:
+            raise ValueError(f"previousDiagram has {len(previousDiagram.siteIds)} sites, but {self._numSites} were specified")
+
+        self._voronoiDiagram = Voronoi(sciPySpatialPoints if ghostSites is None else np.concatenate((sciPySpatialPoints, ghostSites)))
+
+        # Periodic vertices are matched up through qhull's regions, which merging would leave out of step.
+        if prepareBasePoints and not periodic:
+            (self._voronoiDiagram.ridge_points, self._voronoiDiagram.ridge_vertices) = mergeCocircularVertices(vertices = self._voronoiDiagram.vertices, ridgePoints = self._voronoiDiagram.ridge_points, ridgeVertices = self._voronoiDiagram.ridge_vertices)
 
         # _spatial.. values are with respect to the diagram. 
-        self._spatialSites = { uuid4(): Point(x = spatialPoint[0], y = spatialPoint[1]) for spatialPoint in self._voronoiDiagram.points }
+        siteIds = previousDiagram.siteIds if previousDiagram else tuple((uuid4() for _ in range(self._numSites)))
+        self._spatialSites = { siteId: Point(x = spatialPoint[0], y = spatialPoint[1]) for (siteId, spatialPoint) in zip(siteIds, self._voronoiDiagram.points[:self._numSites]) }
         self._spatialSiteKeys = tuple(self._spatialSites.keys())
 
-        self._spatialDiagramVertices = { uuid4(): Point(x = spatialDiagramVertex[0], y = spatialDiagramVertex[1]) for spatialDiagramVertex in self._voronoiDiagram.vertices}
-        spatialDiagramVerticesKeys = list(self._spatialDiagramVertices.keys())
+        vertexSiteIndices = self._findVertexSiteIndices()
+
+        # { <sites equidistant from a diagram vertex>: <that vertex's ID> } - the sites identify the vertex across frames, even as it moves.
+        self._diagramVertexIdsBySites = {}
+        # { <bounding vertex>: <ID it had in previousDiagram> } - bounding vertices have no such sites, so they only keep their ID if they don't move.
+        self._previousBoundingVertexIds = previousDiagram._getBoundingVertexIds() if previousDiagram else {}
+
+        spatialDiagramVerticesKeys = []
+
+        for siteIndices in (() if periodic else vertexSiteIndices):
+            # Ghost sites have no IDs, but their indices are just as stable.
+            vertexSites = frozenset((self._spatialSiteKeys[siteIndex] if siteIndex < self._numSites else siteIndex for siteIndex in siteIndices))
+            previousVertexId = previousDiagram._diagramVertexIdsBySites.get(vertexSites) if previousDiagram else None
+
+            # Cocircular sites can, rarely, give several vertices the same sites - only the first gets to keep the ID.
+            diagramVertexId = uuid4() if not previousVertexId or vertexSites in self._diagramVertexIdsBySites else previousVertexId
+            self._diagramVertexIdsBySites.setdefault(vertexSites, diagramVertexId)
+            spatialDiagramVerticesKeys.append(diagramVertexId)
+
+        self._spatialDiagramVertices = { diagramVertexId: Point(x = spatialDiagramVertex[0], y = spatialDiagramVertex[1]) for (diagramVertexId, spatialDiagramVertex) in zip(spatialDiagramVerticesKeys, self._voronoiDiagram.vertices) }
+
+        # Each periodic vertex has copies - one per image of its sites - which share an ID.
+        if periodic:
+            (spatialDiagramVerticesKeys, representativeVertexIndices) = self._findPeriodicVertexIds(vertexSiteIndices = vertexSiteIndices, previousDiagram = previousDiagram)
 
         # { regionId: <list of VoronoiEdgeIdData describing the edges that bound the region> }
         self._spatialSiteRegionBoundaries: dict[uuid4, list[VoronoiEdge]] = { siteKey: [] for siteKey in self._spatialSiteKeys }
@@ -47,14 +142,199 @@ class VoronoiDiagram:
         # Stores vertices determined as a result of " bounding " calculations.
         self._spatialBoundingVertices: dict[uuid4, Point] = {}
 
+        if windowBox:
+            self._boundRidgesToBox(box = windowBox, spatialDiagramVerticesKeys = spatialDiagramVerticesKeys)
+        elif periodic:
+            self._wrapRidges(spatialDiagramVerticesKeys = spatialDiagramVerticesKeys)
+        else:
+            self._boundRidgesToPlane(spatialDiagramVerticesKeys = spatialDiagramVerticesKeys)
+
+        # A window's halo sites mostly have cells entirely outside it - those aren't output.
+        outputSiteIndices = self._findSitesInBox(box = windowBox) if windowBox else np.arange(self._numSites)
+
+        # siteIds[siteIndex] is the ID of the site that delaunayTriangles' indices refer to.
+        self.siteIds = tuple((self._spatialSiteKeys[outputSiteIndex] for outputSiteIndex in outputSiteIndices.tolist()))
+        self.delaunayTriangles = self._makePeriodicDelaunayTriangles(vertexSiteIndices = vertexSiteIndices, representativeVertexIndices = representativeVertexIndices) if periodic else self._makeDelaunayTriangles(vertexSiteIndices = vertexSiteIndices, box = windowBox, outputSiteIndices = outputSiteIndices)
+
+        # { index of a basePoint dropped as a duplicate: ID of the site it was merged into }
+        self.mergedBasePointIds = { mergedBasePointIndex: self._spatialSiteKeys[siteIndex] for (mergedBasePointIndex, siteIndex) in mergedBasePointIndices.items() if self._spatialSiteKeys[siteIndex] in self.siteIds }
+
+        if windowBox:
+            self._spatialSites = { siteId: self._spatialSites[siteId] for siteId in self.siteIds }
+            self._spatialSiteKeys = self.siteIds
+
+        self.voronoiRegions = { spatialSiteKey: self._makeVoronoiRegion(regionSiteIdentifier = spatialSiteKey) for spatialSiteKey in self._spatialSiteKeys }
+
+        # vertexIds[vertexIndex] is the ID of the vertex at vertexCoordinates()[vertexIndex].
+        self.vertexIds = tuple(self._spatialDiagramVertices.keys()) + tuple(self._spatialBoundingVertices.keys())
+
+        # The geometry is stored once, in the unit square - public-facing values are scaled from it, and are 0, 0 (top-left).
+        self._unitPoints = self._storeUnitCoordinates(unitCoordinates = self._convertPointBases(points = tuple(self._spatialSites.values())))
+        self._unitVertices = self._storeUnitCoordinates(unitCoordinates = self._convertPointBases(points = tuple(self._spatialDiagramVertices.values()) + tuple(self._spatialBoundingVertices.values())))
+
+        # Bounding vertices are the last of vertexIds - a later previousDiagram finds them in _unitVertices.
+        self._numBoundingVertices = len(self._spatialBoundingVertices)
+
+        # Everything else computed on the way is no longer needed.
+        del self._voronoiDiagram, self._spatialSites, self._spatialDiagramVertices, self._spatialSiteRegionBoundaries, self._spatialBoundingVertices
+        if periodic:
+            del self._siteOriginals, self._siteShifts
+
+        self.periodic = periodic
+        self.window = window
+        self._setPlane(planeWidth = planeWidth, planeHeight = planeHeight, originX = 0, originY = 0)
+
+    # For diagrams read back from output rather than computed - they can still be a previousDiagram, but only lend their site IDs.
+    @classmethod
+    def fromComponents(cls, points: dict[uuid4, Point], vertices: dict[uuid4, Point], voronoiRegions: dict[uuid4, VoronoiRegion], delaunayTriangles: np.ndarray, planeWidth: float, planeHeight: float, originX: float = 0, originY: float = 0, window: tuple[float, float, float, float] | None = None, periodic: bool = False, coordinateDtype: type = np.float64) -> VoronoiDiagram:
+        cls._validateCoordinateDtype(coordinateDtype = coordinateDtype)
+        voronoiDiagram = cls.__new__(cls)
+
+        voronoiDiagram.siteIds = tuple(points.keys())
+        voronoiDiagram.coordinateDtype = coordinateDtype
+        voronoiDiagram.periodic = periodic
+        voronoiDiagram.window = window
+        voronoiDiagram.delaunayTriangles = delaunayTriangles
+        voronoiDiagram.mergedBasePointIds = {}
+
+        voronoiDiagram._diagramVertexIdsBySites = {}
+        voronoiDiagram._numBoundingVertices = 0
+
+        voronoiDiagram.voronoiRegions = voronoiRegions
+        voronoiDiagram.vertexIds = tuple(vertices.keys())
+
+        (planeScale, planeOrigin) = (np.array((planeWidth, planeHeight), dtype = np.float64), np.array((originX, originY), dtype = np.float64))
+        # Scaled from the unit square's grid and rounded to 4 decimal places, a plane at least 1 wide and high still rounds back onto it.
+        voronoiDiagram._unitPoints = voronoiDiagram._storeUnitCoordinates(unitCoordinates = (np.array(tuple(points.values()), dtype = np.float64).reshape(-1, 2) - planeOrigin) / planeScale)
+        voronoiDiagram._unitVertices = voronoiDiagram._storeUnitCoordinates(unitCoordinates = (np.array(tuple(vertices.values()), dtype = np.float64).reshape(-1, 2) - planeOrigin) / planeScale)
+
+        voronoiDiagram._setPlane(planeWidth = planeWidth, planeHeight = planeHeight, originX = originX, originY = originY)
+
+        # Keep the values as read, rather than re-scaling them - unless Points aren't kept at all.
+        if voronoiDiagram._keepsPoints():
+            voronoiDiagram._points = points
+            voronoiDiagram._vertices = vertices
+
+        return voronoiDiagram
+
+    def _setPlane(self, planeWidth: float, planeHeight: float, originX: float, originY: float) -> None:
+        self.planeWidth = planeWidth
+        self.planeHeight = planeHeight
+
+        self.originX = originX
+        self.originY = originY
+
+        # points/vertices as Points, and the regionsInRect/nearestRegion index, are only built when first needed.
+        self._points = None
+        self._vertices = None
+        self._voronoiRegionIndex = None
+
+    # This diagram at another plane size, with (0, 0) (top-left) moved to (originX, originY). Only coordinates are re-scaled - IDs, regions and triangles are shared.
+    def rescaled(self, planeWidth: float, planeHeight: float, originX: float = 0, originY: float = 0) -> VoronoiDiagram:
+        rescaledDiagram = copy(self)
+        rescaledDiagram._setPlane(planeWidth = planeWidth, planeHeight = planeHeight, originX = originX, originY = originY)
+
+        return rescaledDiagram
+
+    @staticmethod
+    def _validateCoordinateDtype(coordinateDtype: type) -> None:
+        if coordinateDtype not in coordinateDtypes:
+            raise ValueError(f"coordinateDtype {coordinateDtype} isn't one of {coordinateDtypes}")
+
+    def _keepsPoints(self) -> bool:
+        return self.coordinateDtype == np.float64
+
+    # np.float32 diagrams keep unit-square coordinates as int32 on boundValue's grid.
+    def _storeUnitCoordinates(self, unitCoordinates: np.ndarray) -> np.ndarray:
+        return unitCoordinates if self._keepsPoints() else np.rint(unitCoordinates * _coordinateGridScale).astype(np.int32)
+
+    # Scaled straight into dtype. Grid coordinates are multiplied up before they're divided down, so float64 ones land exactly on 4 decimal places.
+    # (A float32 plane coordinate in the thousands can't hold 4 decimal places - only float64 output keeps boundValue's precision.)
+    def _scaleUnitCoordinates(self, unitCoordinates: np.ndarray, dtype: type = np.float64) -> np.ndarray:
+        (planeScale, planeOrigin) = (np.array((self.planeWidth, self.planeHeight), dtype = dtype), np.array((self.originX, self.originY), dtype = dtype))
+
+        if np.issubdtype(unitCoordinates.dtype, np.integer):
+            scaledCoordinates = ((unitCoordinates.astype(dtype) * planeScale) / _coordinateGridScale) + planeOrigin
+        else:
+            scaledCoordinates = (unitCoordinates.astype(dtype) * planeScale) + planeOrigin
+
+        return np.round(scaledCoordinates, 4)
+
+    # points' coordinates as an (n, 2) array (of coordinateDtype, unless dtype is given), in siteIds' order.
+    def pointCoordinates(self, dtype: type | None = None) -> np.ndarray:
+        return self._scaleUnitCoordinates(unitCoordinates = self._unitPoints, dtype = dtype or self.coordinateDtype)
+
+    # vertices' coordinates as an (n, 2) array (of coordinateDtype, unless dtype is given), in vertexIds' order.
+    def vertexCoordinates(self, dtype: type | None = None) -> np.ndarray:
+        return self._scaleUnitCoordinates(unitCoordinates = self._unitVertices, dtype = dtype or self.coordinateDtype)
+
+    @staticmethod
+    def _makePointDict(pointIds: tuple[uuid4], pointCoordinates: np.ndarray) -> dict[uuid4, Point]:
+        return { pointId: Point(x = pointX, y = pointY) for (pointId, (pointX, pointY)) in zip(pointIds, pointCoordinates.tolist()) }
+
+    # Made when first needed, and kept - except by np.float32 diagrams, which make them again each time (so take one reference to look up many points in).
+    @property
+    def points(self) -> dict[uuid4, Point]:
+        if self._points is not None:
+            return self._points
+
+        points = self._makePointDict(pointIds = self.siteIds, pointCoordinates = self._scaleUnitCoordinates(unitCoordinates = self._unitPoints))
+        if self._keepsPoints():
+            self._points = points
+
+        return points
+
+    @property
+    def vertices(self) -> dict[uuid4, Point]:
+        if self._vertices is not None:
+            return self._vertices
+
+        vertices = self._makePointDict(pointIds = self.vertexIds, pointCoordinates = self._scaleUnitCoordinates(unitCoordinates = self._unitVertices))
+        if self._keepsPoints():
+            self._vertices = vertices
+
+        return vertices
+
+    # { <bounding vertex, with respect to the diagram>: <its ID> } - for a later diagram built with this as its previousDiagram.
+    def _getBoundingVertexIds(self) -> dict[Point, uuid4]:
+        firstBoundingVertexIndex = len(self.vertexIds) - self._numBoundingVertices
+        boundingVertices = self._unitVertices[firstBoundingVertexIndex:]
+
+        if np.issubdtype(boundingVertices.dtype, np.integer):
+            boundingVertices = boundingVertices / _coordinateGridScale
+
+        # Back to 0, 0 (bottom-left), as _convertPointBases had them.
+        return { Point(x = boundingX, y = 1 - boundingY): boundingVertexId for (boundingVertexId, (boundingX, boundingY)) in zip(self.vertexIds[firstBoundingVertexIndex:], boundingVertices.tolist()) }
+
+    def _getVoronoiRegionIndex(self) -> VoronoiRegionIndex:
+        if self._voronoiRegionIndex is None:
+            # window is in basePoints' terms - the index needs it scaled, like points/vertices.
+            indexWindow = tuple(self._scaleUnitCoordinates(unitCoordinates = np.array(self.window, dtype = np.float64).reshape(2, 2)).ravel().tolist()) if self.window else None
+            self._voronoiRegionIndex = VoronoiRegionIndex(points = self.points, vertices = self.vertices, voronoiRegions = self.voronoiRegions, planeWidth = self.planeWidth, planeHeight = self.planeHeight, originX = self.originX, originY = self.originY, periodic = self.periodic, window = indexWindow)
+
+        return self._voronoiRegionIndex
+
+    # Regions whose bounding boxes intersect the rectangle (x0, y0) -> (x1, y1), in the same scaled, 0, 0 (top-left) coordinates as points/vertices.
+    def regionsInRect(self, x0: float, y0: float, x1: float, y1: float) -> tuple[VoronoiRegion]:
+        return self._getVoronoiRegionIndex().regionsInRect(x0 = x0, y0 = y0, x1 = x1, y1 = y1)
+
+    # The region containing (x, y) - None if that's outside the plane, or the window.
+    def nearestRegion(self, x: float, y: float) -> VoronoiRegion | None:
+        return self._getVoronoiRegionIndex().nearestRegion(x = x, y = y)
+        
+    # Bounds each ridge to the plane, one by one.
+    def _boundRidgesToPlane(self, spatialDiagramVerticesKeys: list[uuid4]) -> None:
         # Store vertices that get bounded for later deletion.
         boundedDiagramVertices = []
 
+        # Vertices only on ridges between ghost sites are deleted too.
+        referencedDiagramVertexIndices = set()
+
         # voronoiRegionsInfo[pointIndex] describes the region identified by self._spatialSitesKeys[pointIndex].
-        voronoiRegionsInfo = tuple((self._makeVoronoiRegionData(regionSiteIdIndex = pointIndex) for pointIndex in range(len(self._voronoiDiagram.points))))
+        voronoiRegionsInfo = tuple((self._makeVoronoiRegionData(regionSiteIdIndex = pointIndex) for pointIndex in range(self._numSites)))
         
         # Handling len(basePoints) = 3 case where Voronoi diagram is created with only one vertex.
-        numBasePoints = len(basePoints)
+        numBasePoints = len(self._voronoiDiagram.points)
         vertices = self._voronoiDiagram.ridge_vertices
         verticesToZip = vertices if numBasePoints > minBasePoints else tuple(repeat(vertices[0], numBasePoints))
         
@@ -62,6 +342,11 @@ class VoronoiDiagram:
         edgeVerticesAndSites = () if False else zip(verticesToZip, self._voronoiDiagram.ridge_points)
 
         for ([edgeVertex0Index, edgeVertex1Index], [edgeSite0Index, edgeSite1Index]) in edgeVerticesAndSites:
+            if edgeSite0Index >= self._numSites or edgeSite1Index >= self._numSites:
+                continue
+
+            referencedDiagramVertexIndices.update((edgeVertex0Index, edgeVertex1Index))
+
             vertex0OutOfDiagram = edgeVertex0Index == -1
             vertex1OutOfDiagram = edgeVertex1Index == -1
 
@@ -144,9 +429,17 @@ class VoronoiDiagram:
 
                     latestMidpoint = reflectedSitesMidpoint or betweenRegionsMidpoint
 
+                    # A vertex at the midpoint (to boundValue's precision) gives no direction to go in.
+                    if latestMidpoint == pointInsideDiagram:
+                        latestMidpoint = self._findPointAlongRidge(vertex = pointInsideDiagram, site1 = regionSite, site2 = neighborSite)
+
                     maybeBoundedPointInsideDiagram = self._boundVertex(vertex = pointInsideDiagram, otherVertex = latestMidpoint, boundingNeeded = pointInsideDiagramNeedsBounding) if pointInsideDiagramNeedsBounding else None
                     latestPointInsideDiagram = maybeBoundedPointInsideDiagram or pointInsideDiagram
 
+                    # Nor does a vertex bounded onto it.
+                    if latestMidpoint == latestPointInsideDiagram:
+                        latestMidpoint = self._findPointAlongRidge(vertex = latestPointInsideDiagram, site1 = regionSite, site2 = neighborSite)
+
                     if maybeBoundedPointInsideDiagram and pointInsideDiagramId not in boundedDiagramVertices:
                         boundedDiagramVertices.append(pointInsideDiagramId)
 
@@ -174,16 +467,117 @@ class VoronoiDiagram:
         for boundedDiagramVertex in boundedDiagramVertices:
             del self._spatialDiagramVertices[boundedDiagramVertex]
 
-        self.voronoiRegions = { spatialSiteKey: self._makeVoronoiRegion(regionSiteIdentifier = spatialSiteKey) for spatialSiteKey in self._spatialSiteKeys }
+        for (diagramVertexIndex, diagramVertexId) in enumerate(spatialDiagramVerticesKeys):
+            if diagramVertexIndex not in referencedDiagramVertexIndices and diagramVertexId in self._spatialDiagramVertices:
+                del self._spatialDiagramVertices[diagramVertexId]
 
-        # Public-facing values are 0, 0 (top-left).
-        self.points = {pointId: point.convertPointBase().scale(widthScalar = planeWidth, heightScalar = planeHeight) for (pointId, point) in self._spatialSites.items()}
-        
-        convertedDiagramVertices = {diagramVertexId: diagramVertex.convertPointBase().scale(widthScalar = planeWidth, heightScalar = planeHeight) for (diagramVertexId, diagramVertex) in self._spatialDiagramVertices.items()}
-        convertedBoundingVertices = {boundingVertexId: boundingVertex.convertPointBase().scale(widthScalar = planeWidth, heightScalar = planeHeight) for (boundingVertexId, boundingVertex) in self._spatialBoundingVertices.items()}
+    # Clips every ridge to box at once - suits windows, where most ridges miss box entirely.
+    def _boundRidgesToBox(self, box: tuple[float, float, float, float], spatialDiagramVerticesKeys: list[uuid4]) -> None:
+        ridgePoints = np.asarray(self._voronoiDiagram.ridge_points)
+        ridgeVertices = np.asarray(self._voronoiDiagram.ridge_vertices)
+
+        (vertex0s, vertex1s, vertex0sClipped, vertex1sClipped, ridgesInBox) = clipRidgesToBox(sites = self._voronoiDiagram.points, vertices = self._voronoiDiagram.vertices, ridgePoints = ridgePoints, ridgeVertices = ridgeVertices, box = box, center = self._voronoiDiagram.points.mean(axis = 0))
+        ridgesBetweenSites = (ridgePoints < self._numSites).all(axis = 1)
+
+        # { bounding vertex: its ID } - ridges meeting on box's boundary share their vertex there.
+        boundingVertexIds: dict[Point, uuid4] = {}
+        referencedDiagramVertexIds = set()
+
+        for ridgeIndex in np.flatnonzero(ridgesInBox & ridgesBetweenSites).tolist():
+            edgeVertexIds = []
+
+            for (vertexIndex, vertex, vertexClipped) in ((ridgeVertices[ridgeIndex, 0], vertex0s[ridgeIndex], vertex0sClipped[ridgeIndex]), (ridgeVertices[ridgeIndex, 1], vertex1s[ridgeIndex], vertex1sClipped[ridgeIndex])):
+                if vertexClipped:
+                    boundingVertex = Point(x = vertex[0], y = vertex[1])
+                    boundingVertexId = boundingVertexIds.get(boundingVertex) or uuid4()
+
+                    boundingVertexIds[boundingVertex] = boundingVertexId
+                    self._spatialBoundingVertices[boundingVertexId] = boundingVertex
+                    edgeVertexIds.append(boundingVertexId)
+                else:
+                    diagramVertexId = spatialDiagramVerticesKeys[vertexIndex]
+
+                    referencedDiagramVertexIds.add(diagramVertexId)
+                    edgeVertexIds.append(diagramVertexId)
+
+            (edgeSite0Id, edgeSite1Id) = (self._spatialSiteKeys[ridgePoints[ridgeIndex, 0]], self._spatialSiteKeys[ridgePoints[ridgeIndex, 1]])
+
+            self._spatialSiteRegionBoundaries[edgeSite0Id].append(VoronoiEdge(vertex0Id = edgeVertexIds[0], vertex1Id = edgeVertexIds[1], neighborSiteId = edgeSite1Id))
+            self._spatialSiteRegionBoundaries[edgeSite1Id].append(VoronoiEdge(vertex0Id = edgeVertexIds[0], vertex1Id = edgeVertexIds[1], neighborSiteId = edgeSite0Id))
+
+        self._spatialDiagramVertices = { diagramVertexId: diagramVertex for (diagramVertexId, diagramVertex) in self._spatialDiagramVertices.items() if diagramVertexId in referencedDiagramVertexIds }
+
+    # A periodic vertex is identified by its sites' images relative to each other: (site ID, shift) pairs, moved so the least site's shift is (0, 0).
+    def _makePeriodicVertexSites(self, siteIndices: set[int]) -> frozenset:
+        vertexSites = tuple(((self._siteOriginals[siteIndex], tuple(self._siteShifts[siteIndex].tolist())) for siteIndex in siteIndices))
+
+        # Only few sites can have images at one vertex - then, the least of each choice of anchor.
+        leastOriginal = min((siteOriginal for (siteOriginal, _) in vertexSites))
+        relativeSites = min((tuple(sorted(((siteOriginal, shiftX - anchorX, shiftY - anchorY) for (siteOriginal, (shiftX, shiftY)) in vertexSites))) for (anchorOriginal, (anchorX, anchorY)) in vertexSites if anchorOriginal == leastOriginal))
+
+        return frozenset(((self._spatialSiteKeys[siteOriginal], shiftX, shiftY) for (siteOriginal, shiftX, shiftY) in relativeSites))
+
+    # Returns (<ID of each qhull vertex, or None if it isn't on a site's region>, <the first qhull vertex of each ID>), and sets _spatialDiagramVertices to those first vertices, wrapped into the plane.
+    # Vertices further out can be missing some of their sites, so only those on a site's (complete) region are looked at.
+    def _findPeriodicVertexIds(self, vertexSiteIndices: tuple[set[int]], previousDiagram: VoronoiDiagram | None) -> tuple[list[uuid4 | None], list[int]]:
+        spatialDiagramVerticesKeys = [None] * len(self._voronoiDiagram.vertices)
+        representativeVertexIndices = []
+
+        for siteIndex in range(self._numSites):
+            for vertexIndex in self._voronoiDiagram.regions[self._voronoiDiagram.point_region[siteIndex]]:
+                if spatialDiagramVerticesKeys[vertexIndex] is None:
+                    vertexSites = self._makePeriodicVertexSites(siteIndices = vertexSiteIndices[vertexIndex])
+
+                    if vertexSites not in self._diagramVertexIdsBySites:
+                        previousVertexId = previousDiagram._diagramVertexIdsBySites.get(vertexSites) if previousDiagram else None
+                        self._diagramVertexIdsBySites[vertexSites] = previousVertexId or uuid4()
+                        representativeVertexIndices.append(vertexIndex)
+
+                    spatialDiagramVerticesKeys[vertexIndex] = self._diagramVertexIdsBySites[vertexSites]
+
+        wrappedVertices = np.mod(self._voronoiDiagram.vertices[representativeVertexIndices], 1)
+        self._spatialDiagramVertices = { spatialDiagramVerticesKeys[vertexIndex]: Point(x = wrappedVertex[0], y = wrappedVertex[1]) for (vertexIndex, wrappedVertex) in zip(representativeVertexIndices, wrappedVertices.tolist()) }
+
+        return spatialDiagramVerticesKeys, representativeVertexIndices
+
+    # Periodic regions are complete - no bounding needed - so each ridge of a site's region is an edge, with its neighbor's image standing in for the neighbor.
+    def _wrapRidges(self, spatialDiagramVerticesKeys: list[uuid4 | None]) -> None:
+        for ((vertex0Index, vertex1Index), ridgeSiteIndices) in zip(self._voronoiDiagram.ridge_vertices, self._voronoiDiagram.ridge_points.tolist()):
+            for (regionSiteIndex, neighborSiteIndex) in (ridgeSiteIndices, ridgeSiteIndices[::-1]):
+                if regionSiteIndex < self._numSites:
+                    regionId = self._spatialSiteKeys[regionSiteIndex]
+                    neighborSiteId = self._spatialSiteKeys[self._siteOriginals[neighborSiteIndex]]
+
+                    self._spatialSiteRegionBoundaries[regionId].append(VoronoiEdge(vertex0Id = spatialDiagramVerticesKeys[vertex0Index], vertex1Id = spatialDiagramVerticesKeys[vertex1Index], neighborSiteId = neighborSiteId))
+
+    # Indices of the sites whose cells reach into box: those with an edge in it, plus any cell containing all of box - which holds box's corners.
+    def _findSitesInBox(self, box: tuple[float, float, float, float]) -> np.ndarray:
+        sitesWithEdges = tuple((siteIndex for (siteIndex, siteKey) in enumerate(self._spatialSiteKeys) if self._spatialSiteRegionBoundaries[siteKey]))
+
+        (minX, minY, maxX, maxY) = box
+        boxCorners = np.array(((minX, minY), (maxX, minY), (minX, maxY), (maxX, maxY)))
+
+        sites = self._voronoiDiagram.points[:self._numSites]
+        cornerSites = np.argmin(np.hypot(sites[:, 0] - boxCorners[:, 0, None], sites[:, 1] - boxCorners[:, 1, None]), axis = 1)
+
+        return np.union1d(np.array(sitesWithEdges, dtype = np.intp), cornerSites)
+
+    # Point.convertPointBase for every point at once - one Point per point is most of a window's cost otherwise.
+    @staticmethod
+    def _convertPointBases(points: tuple[Point]) -> np.ndarray:
+        convertedPoints = np.array(tuple(((point.x, point.y) for point in points)), dtype = np.float64).reshape(-1, 2)
+        convertedPoints[:, 1] = np.round(1 - convertedPoints[:, 1], 4)
+
+        return convertedPoints
+
+    def _makeWindowBox(self, window: tuple[float, float, float, float]) -> tuple[float, float, float, float]:
+        (windowX0, windowY0, windowX1, windowY1) = window
+
+        if not (0 <= windowX0 < windowX1 <= 1 and 0 <= windowY0 < windowY1 <= 1):
+            raise ValueError(f"window {window} must be (x0, y0, x1, y1) with 0 <= x0 < x1 <= 1 and 0 <= y0 < y1 <= 1")
+
+        return tuple((windowX0, boundValue(value = 1 - windowY1), windowX1, boundValue(value = 1 - windowY0)))
 
-        self.vertices = convertedDiagramVertices | convertedBoundingVertices
-        
     def _validateBasePoints(self, basePoints: tuple[Point]) -> None:
         if len(basePoints) < minBasePoints:
             raise ValueError(f"Too few points specified, {basePoints} - need minimum {minBasePoints}")
@@ -202,8 +596,8 @@ class VoronoiDiagram:
             # Return the first (and only) result.
             return extantIdSearchResult[0]
         else:
-            # Return a new ID that will be stored.
-            return uuid4()
+            # Return a new ID (or the ID this vertex had in previousDiagram) that will be stored.
+            return self._previousBoundingVertexIds.get(boundingVertex) or uuid4()
 
     def _pointXWithinBounds(self, point: Point) -> bool:
         return 0 <= point.x <= 1
@@ -270,12 +664,72 @@ class VoronoiDiagram:
         reflection = Point(x = reflectionX, y = reflectionY)
         return reflection
     
+    # A point 1 away from vertex along the ridge between site1 and site2, on the side away from the sites' center - the way scipy.spatial.voronoi_plot_2d extends infinite ridges.
+    def _findPointAlongRidge(self, vertex: Point, site1: Point, site2: Point) -> Point:
+        (sitesDx, sitesDy) = tuple((site2.x - site1.x, site2.y - site1.y))
+        sitesDistance = Point.distance(p1 = site1, p2 = site2)
+        (ridgeDx, ridgeDy) = tuple((-sitesDy / sitesDistance, sitesDx / sitesDistance))
+
+        (centerX, centerY) = self._voronoiDiagram.points[:self._numSites].mean(axis = 0).tolist()
+        sitesMidpoint = Point.midpoint(p1 = site1, p2 = site2)
+        ridgeSign = 1 if ((sitesMidpoint.x - centerX) * ridgeDx) + ((sitesMidpoint.y - centerY) * ridgeDy) >= 0 else -1
+
+        return Point(x = vertex.x + (ridgeSign * ridgeDx), y = vertex.y + (ridgeSign * ridgeDy))
+
     def _reflectSitesAndCalculateMidpoint(self, site1: Point, site2: Point, vertex: Point) -> Point:
         reflectedSite1 = self._reflectPointAroundVertex(point = site1, vertex = vertex)
         reflectedSite2 = self._reflectPointAroundVertex(point = site2, vertex = vertex)
 
         return Point.midpoint(p1 = reflectedSite1, p2 = reflectedSite2)
     
+    # Each diagram vertex is equidistant from the sites whose ridges meet at it.
+    def _findVertexSiteIndices(self) -> tuple[set[int]]:
+        vertexSiteIndices = tuple((set() for _ in range(len(self._voronoiDiagram.vertices))))
+
+        for (ridgeVertexIndices, ridgeSiteIndices) in zip(self._voronoiDiagram.ridge_vertices, self._voronoiDiagram.ridge_points):
+            for ridgeVertexIndex in ridgeVertexIndices:
+                if ridgeVertexIndex != -1:
+                    vertexSiteIndices[ridgeVertexIndex].update(ridgeSiteIndices.tolist())
+
+        return vertexSiteIndices
+
+    # Those sites are the vertex's dual Delaunay polygon.
+    # With box, only the triangles whose vertex is inside it - those outside might have been changed by sites left out of a window.
+    def _makeDelaunayTriangles(self, vertexSiteIndices: tuple[set[int]], box: tuple[float, float, float, float] | None, outputSiteIndices: np.ndarray) -> np.ndarray:
+        triangles = []
+
+        for ([vertexX, vertexY], siteIndices) in zip(self._voronoiDiagram.vertices, vertexSiteIndices):
+            if any((siteIndex >= self._numSites for siteIndex in siteIndices)):
+                continue
+
+            if box and not (box[0] <= vertexX <= box[2] and box[1] <= vertexY <= box[3]):
+                continue
+
+            triangles.extend(self._fanVertexSites(vertexX = vertexX, vertexY = vertexY, siteIndices = siteIndices))
+
+        # Re-index from qhull's sites to the output ones.
+        outputSitePositions = np.full(self._numSites, -1, dtype = np.intp)
+        outputSitePositions[outputSiteIndices] = np.arange(len(outputSiteIndices))
+
+        return outputSitePositions[np.array(triangles, dtype = np.intp).reshape(-1, 3)]
+
+    # One copy of each periodic vertex, its sites' images standing in for the sites.
+    def _makePeriodicDelaunayTriangles(self, vertexSiteIndices: tuple[set[int]], representativeVertexIndices: list[int]) -> np.ndarray:
+        triangles = []
+
+        for vertexIndex in representativeVertexIndices:
+            (vertexX, vertexY) = self._voronoiDiagram.vertices[vertexIndex].tolist()
+            triangles.extend(self._fanVertexSites(vertexX = vertexX, vertexY = vertexY, siteIndices = vertexSiteIndices[vertexIndex]))
+
+        return self._siteOriginals[np.array(triangles, dtype = np.intp).reshape(-1, 3)]
+
+    # Counter-clockwise (bottom-left origin) around the vertex, then fanned - > 3 sites only happens for cocircular sites.
+    def _fanVertexSites(self, vertexX: float, vertexY: float, siteIndices: set[int]) -> list[tuple[int, int, int]]:
+        sitePoints = self._voronoiDiagram.points
+        orderedSiteIndices = sorted(siteIndices, key = lambda siteIndex: atan2(sitePoints[siteIndex][1] - vertexY, sitePoints[siteIndex][0] - vertexX))
+
+        return [tuple((orderedSiteIndices[0], orderedSiteIndices[fanIndex], orderedSiteIndices[fanIndex + 1])) for fanIndex in range(1, len(orderedSiteIndices) - 1)]
+
     def _makeVoronoiRegion(self, regionSiteIdentifier: uuid4) -> VoronoiRegion:
         regionEdges = self._spatialSiteRegionBoundaries[regionSiteIdentifier]
         return VoronoiRegion(siteId = regionSiteIdentifier, edges = regionEdges)
\ No newline at end of file
@@ -1,8 +1,24 @@
-from json import dump as writeJsonOut
+from json import dump as writeJsonOut, load as readJsonIn
 
 from .VoronoiDiagram import VoronoiDiagram
+from .diffs.VoronoiDiagramDiff import VoronoiDiagramDiff
+from .jsonOut.CompactVoronoiJSON import CompactVoronoiJSONEncoder, compactJsonToVoronoiDiagram
 from .jsonOut.VoronoiJSONEncoder import VoronoiJSONEncoder
 
-def toJson(voronoiDiagram: VoronoiDiagram, voronoiJsonPath: str):
+# compact writes integer coordinates and index-based regions instead of UUIDs - deltaEncode, only meaningful with compact, makes those integers smaller still.
+def toJson(voronoiDiagram: VoronoiDiagram, voronoiJsonPath: str, compact: bool = False, deltaEncode: bool = False):
     with open(voronoiJsonPath, "w") as jsonOut:
-        writeJsonOut(obj = voronoiDiagram, fp = jsonOut, cls = VoronoiJSONEncoder)
\ No newline at end of file
+        if compact:
+            writeJsonOut(obj = voronoiDiagram, fp = jsonOut, cls = CompactVoronoiJSONEncoder, deltaEncode = deltaEncode, separators = (",", ":"))
+        else:
+            writeJsonOut(obj = voronoiDiagram, fp = jsonOut, cls = VoronoiJSONEncoder)
+
+# Writes only what changed since previousDiagram - currentDiagram should have been built with previousDiagram = previousDiagram.
+def toJsonDelta(previousDiagram: VoronoiDiagram, currentDiagram: VoronoiDiagram, voronoiJsonPath: str):
+    with open(voronoiJsonPath, "w") as jsonOut:
+        writeJsonOut(obj = VoronoiDiagramDiff.between(previousDiagram = previousDiagram, currentDiagram = currentDiagram), fp = jsonOut, cls = VoronoiJSONEncoder)
+
+# Reads toJson(.., compact = True) output back into a VoronoiDiagram.
+def fromCompactJson(voronoiJsonPath: str) -> VoronoiDiagram:
+    with open(voronoiJsonPath) as jsonIn:
+        return compactJsonToVoronoiDiagram(compactJson = readJsonIn(jsonIn))
\ No newline at end of file
@@ -8,5 +8,9 @@ from .edges.VoronoiEdgeData import VoronoiEdgeData
 
 from .regions.VoronoiRegion import VoronoiRegion
 
+from .diffs.VoronoiDiagramDiff import VoronoiDiagramDiff
+
+from .batches.VoronoiDiagramBatch import VoronoiDiagramBatch
+
 from .jsonOut import VoronoiJSONEncoder
-from .VoronoiDiagramToJSON import toJson
\ No newline at end of file
+from .VoronoiDiagramToJSON import toJson, toJsonDelta, fromCompactJson
\ No newline at end of file
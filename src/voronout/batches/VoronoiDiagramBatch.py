@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import ceil, sqrt
+
+from scipy.spatial import Voronoi
+
+from ..Point import Point
+from ..VoronoiDiagram import minBasePoints
+
+from ..utils.RidgeClipping import clipRidgesToBox
+
+import numpy as np
+
+# Diagrams are laid out this far apart, in unit squares. A point in a diagram's square is within sqrt(2) of one of its sites, and at least _diagramSpacing - 1 from any other diagram's - so other diagrams never change it.
+_diagramSpacing = 3
+
+# boundValue keeps 4 decimal places, so scaling by this puts bounding vertices on an integer grid - ridges meeting on a square's edge share theirs.
+_vertexGridScale = 10000
+
+# Many small VoronoiDiagrams, built and clipped together - with one qhull call, and array operations across every diagram rather than Python per diagram.
+# There are no IDs or Points: diagram diagramIndex's values are rows siteOffsets[diagramIndex]:siteOffsets[diagramIndex + 1] of points, and so on.
+# Edges are clipped exactly to each diagram's square, like a VoronoiDiagram with window = (0, 0, 1, 1) - not like a default VoronoiDiagram, whose Boundary clipping puts
+# vertices on the plane's edges elsewhere, and can give regions other neighbors there.
+# Like VoronoiDiagram's, points and vertices are 0, 0 (top-left), scaled to the plane. Each edges row is (vertex0, vertex1, site, neighborSite), indexing into its diagram's vertices/points, and a site's edges are together.
+@dataclass(frozen=True)
+class VoronoiDiagramBatch:
+    planeWidth: float
+    planeHeight: float
+
+    siteOffsets: np.ndarray
+    points: np.ndarray
+
+    vertexOffsets: np.ndarray
+    vertices: np.ndarray
+
+    edgeOffsets: np.ndarray
+    edges: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.siteOffsets) - 1
+
+    # (points, vertices, edges) for one diagram - views into the batch's arrays.
+    def diagramArrays(self, diagramIndex: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return tuple((
+            self.points[self.siteOffsets[diagramIndex]:self.siteOffsets[diagramIndex + 1]],
+            self.vertices[self.vertexOffsets[diagramIndex]:self.vertexOffsets[diagramIndex + 1]],
+            self.edges[self.edgeOffsets[diagramIndex]:self.edgeOffsets[diagramIndex + 1]]
+        ))
+
+    @staticmethod
+    def _validateBasePoints(baseCoordinates: np.ndarray, siteCounts: np.ndarray) -> None:
+        if (siteCounts < minBasePoints).any():
+            raise ValueError(f"Diagrams {np.flatnonzero(siteCounts < minBasePoints).tolist()} have too few points specified - need minimum {minBasePoints}")
+
+        if ((baseCoordinates < 0) | (baseCoordinates > 1)).any():
+            raise ValueError("basePointSets violate the x/y must be >= 0, <= 1 constraint")
+
+        # Sites that boundValue rounds to the same place would share a region, leaving both without edges.
+        siteDiagrams = np.repeat(np.arange(len(siteCounts)), siteCounts)
+        siteGridCells = np.rint(baseCoordinates * _vertexGridScale).astype(np.int64)
+
+        siteOrder = np.lexsort((siteGridCells[:, 1], siteGridCells[:, 0], siteDiagrams))
+        duplicateSites = (np.diff(siteDiagrams[siteOrder]) == 0) & (np.diff(siteGridCells[siteOrder], axis = 0) == 0).all(axis = 1)
+
+        if duplicateSites.any():
+            raise ValueError(f"Diagrams {np.unique(siteDiagrams[siteOrder][1:][duplicateSites]).tolist()} have points in the same place - dedupe them first, as VoronoiDiagram's prepareBasePoints does")
+
+    # Each row of a layout is (minX, minY, maxX, maxY) of one diagram's square.
+    @staticmethod
+    def _makeDiagramBoxes(numDiagrams: int) -> np.ndarray:
+        layoutColumns = ceil(sqrt(numDiagrams))
+        diagramCorners = np.column_stack((np.arange(numDiagrams) % layoutColumns, np.arange(numDiagrams) // layoutColumns)) * _diagramSpacing
+
+        return np.concatenate((diagramCorners, diagramCorners + 1), axis = 1).astype(np.float64)
+
+    # Three sites far outside the layout make qhull's input 2D even if every diagram's sites are collinear. They're never output.
+    @staticmethod
+    def _makeGhostSites(diagramBoxes: np.ndarray) -> np.ndarray:
+        layoutExtent = diagramBoxes[:, 2:].max() + _diagramSpacing
+        return np.array(((-_diagramSpacing, -_diagramSpacing), (layoutExtent, -_diagramSpacing), (-_diagramSpacing, layoutExtent)), dtype = np.float64)
+
+    # basePointSets are each a VoronoiDiagram's basePoints - Points, or (n, 2) arrays of (x, y), within (0, 0) -> (1, 1) with 0, 0 (top-left).
+    @staticmethod
+    def build(basePointSets: tuple[tuple[Point] | np.ndarray], planeWidth: float, planeHeight: float) -> VoronoiDiagramBatch:
+        if not len(basePointSets):
+            raise ValueError("No basePointSets specified")
+
+        siteCounts = np.array(tuple((len(basePointSet) for basePointSet in basePointSets)), dtype = np.intp)
+        siteOffsets = np.concatenate(((0,), np.cumsum(siteCounts)))
+
+        baseCoordinates = np.concatenate(tuple((np.asarray(basePointSet, dtype = np.float64).reshape(-1, 2) for basePointSet in basePointSets)))
+        VoronoiDiagramBatch._validateBasePoints(baseCoordinates = baseCoordinates, siteCounts = siteCounts)
+
+        # Like VoronoiDiagram, work in scipy.spatial's 0, 0 (bottom-left) - each diagram moved to its square in the layout.
+        unitSites = np.round(baseCoordinates, 4)
+        unitSites[:, 1] = np.round(1 - unitSites[:, 1], 4)
+
+        siteDiagrams = np.repeat(np.arange(len(siteCounts)), siteCounts)
+        diagramBoxes = VoronoiDiagramBatch._makeDiagramBoxes(numDiagrams = len(siteCounts))
+        layoutSites = unitSites + diagramBoxes[siteDiagrams, :2]
+
+        numSites = len(layoutSites)
+        voronoiDiagram = Voronoi(np.concatenate((layoutSites, VoronoiDiagramBatch._makeGhostSites(diagramBoxes = diagramBoxes))))
+
+        # Only ridges between one diagram's sites are its own - ridges between diagrams (or with a ghost site) are in the space between their squares.
+        ridgePoints = np.asarray(voronoiDiagram.ridge_points, dtype = np.intp)
+        ridgeVertices = np.asarray(voronoiDiagram.ridge_vertices, dtype = np.intp)
+
+        ridgesBetweenSites = (ridgePoints < numSites).all(axis = 1)
+        (ridgePoints, ridgeVertices) = (ridgePoints[ridgesBetweenSites], ridgeVertices[ridgesBetweenSites])
+
+        ridgeDiagrams = siteDiagrams[ridgePoints[:, 0]]
+        ridgesWithinDiagram = ridgeDiagrams == siteDiagrams[ridgePoints[:, 1]]
+        (ridgePoints, ridgeVertices, ridgeDiagrams) = (ridgePoints[ridgesWithinDiagram], ridgeVertices[ridgesWithinDiagram], ridgeDiagrams[ridgesWithinDiagram])
+
+        (vertex0s, vertex1s, vertex0sClipped, vertex1sClipped, ridgesInBox) = clipRidgesToBox(sites = voronoiDiagram.points, vertices = voronoiDiagram.vertices, ridgePoints = ridgePoints, ridgeVertices = ridgeVertices, box = diagramBoxes[ridgeDiagrams], center = voronoiDiagram.points.mean(axis = 0))
+        (ridgePoints, ridgeVertices, ridgeDiagrams) = (ridgePoints[ridgesInBox], ridgeVertices[ridgesInBox], ridgeDiagrams[ridgesInBox])
+
+        # Each ridge's vertex0 then vertex1, so ridge ridgeIndex's are ridgeEnds[ridgeIndex] and ridgeEnds[ridgeIndex + numRidges].
+        numRidges = len(ridgePoints)
+        ridgeEnds = np.round(np.concatenate((vertex0s[ridgesInBox], vertex1s[ridgesInBox])), 4)
+        ridgeEndsClipped = np.concatenate((vertex0sClipped[ridgesInBox], vertex1sClipped[ridgesInBox]))
+        ridgeEndDiagrams = np.concatenate((ridgeDiagrams, ridgeDiagrams))
+
+        # A vertex is qhull's index for it or - for bounding vertices - where it is on the grid, after all of qhull's. Either is only ever in one diagram.
+        ridgeEndGridCells = np.rint(ridgeEnds * _vertexGridScale).astype(np.int64)
+        gridRowLength = ridgeEndGridCells[:, 1].max(initial = 0) + 1
+
+        ridgeEndQhullIndices = np.concatenate((ridgeVertices[:, 0], ridgeVertices[:, 1]))
+        ridgeEndKeys = np.where(ridgeEndsClipped, len(voronoiDiagram.vertices) + (ridgeEndGridCells[:, 0] * gridRowLength) + ridgeEndGridCells[:, 1], ridgeEndQhullIndices)
+
+        # Sorting by diagram, then key, numbers the vertices diagram by diagram.
+        ridgeEndOrder = np.lexsort((ridgeEndKeys, ridgeEndDiagrams))
+        sortedRidgeEndKeys = ridgeEndKeys[ridgeEndOrder]
+        startsVertex = np.concatenate(((True,), sortedRidgeEndKeys[1:] != sortedRidgeEndKeys[:-1]))
+
+        ridgeEndVertices = np.empty(len(ridgeEndKeys), dtype = np.intp)
+        ridgeEndVertices[ridgeEndOrder] = np.cumsum(startsVertex) - 1
+
+        firstRidgeEnds = ridgeEndOrder[startsVertex]
+        vertexDiagrams = ridgeEndDiagrams[firstRidgeEnds]
+        vertexOffsets = np.searchsorted(vertexDiagrams, np.arange(len(siteCounts) + 1))
+
+        # Each ridge is an edge of both its sites' regions, with the same vertex order - sorted by site, which also sorts by diagram.
+        edgeSites = np.concatenate((ridgePoints[:, 0], ridgePoints[:, 1]))
+        edgeNeighborSites = np.concatenate((ridgePoints[:, 1], ridgePoints[:, 0]))
+        edgeVertices = np.tile(ridgeEndVertices.reshape(2, numRidges).T, (2, 1))
+        edgeDiagrams = np.concatenate((ridgeDiagrams, ridgeDiagrams))
+
+        edgeOrder = np.argsort(edgeSites, kind = "stable")
+        (edgeSites, edgeNeighborSites, edgeVertices, edgeDiagrams) = (edgeSites[edgeOrder], edgeNeighborSites[edgeOrder], edgeVertices[edgeOrder], edgeDiagrams[edgeOrder])
+
+        edgeOffsets = np.searchsorted(edgeDiagrams, np.arange(len(siteCounts) + 1))
+
+        # Re-index from the batch's sites/vertices to each diagram's.
+        edges = np.column_stack((
+            edgeVertices - vertexOffsets[edgeDiagrams, None],
+            edgeSites - siteOffsets[edgeDiagrams],
+            edgeNeighborSites - siteOffsets[edgeDiagrams]
+        ))
+
+        # Back to each diagram's own 0, 0 (top-left), then scaled like VoronoiDiagram's points/vertices.
+        unitVertices = np.round(ridgeEnds[firstRidgeEnds] - diagramBoxes[vertexDiagrams, :2], 4)
+        unitVertices[:, 1] = np.round(1 - unitVertices[:, 1], 4)
+
+        planeScale = np.array((planeWidth, planeHeight), dtype = np.float64)
+
+        return VoronoiDiagramBatch(
+            planeWidth = planeWidth,
+            planeHeight = planeHeight,
+            siteOffsets = siteOffsets,
+            points = np.round(np.round(baseCoordinates, 4) * planeScale, 4),
+            vertexOffsets = vertexOffsets,
+            vertices = np.round(unitVertices * planeScale, 4),
+            edgeOffsets = edgeOffsets,
+            edges = edges
+        )
\ No newline at end of file
@@ -0,0 +1,69 @@
+from ...Point import Point
+from ...VoronoiDiagram import VoronoiDiagram
+from ..VoronoiDiagramBatch import VoronoiDiagramBatch
+
+from pytest import raises
+from scipy.spatial import cKDTree
+
+import numpy as np
+
+planeWidth = 600
+planeHeight = 400
+
+rng = np.random.default_rng(seed = 36)
+basePointSets = tuple((rng.random((rng.integers(5, 51), 2)) for _ in range(40)))
+voronoiDiagramBatch = VoronoiDiagramBatch.build(basePointSets = basePointSets, planeWidth = planeWidth, planeHeight = planeHeight)
+
+def test_batch_matches_diagrams():
+    assert len(voronoiDiagramBatch) == len(basePointSets)
+
+    for (diagramIndex, basePointSet) in enumerate(basePointSets):
+        # A whole-plane window clips the same way, one diagram at a time.
+        voronoiDiagram = VoronoiDiagram(basePoints = tuple((Point(x = baseX, y = baseY) for (baseX, baseY) in basePointSet.tolist())), planeWidth = planeWidth, planeHeight = planeHeight, window = (0, 0, 1, 1))
+        (points, vertices, edges) = voronoiDiagramBatch.diagramArrays(diagramIndex = diagramIndex)
+
+        assert np.array_equal(points, voronoiDiagram.pointCoordinates())
+
+        # To within boundValue's rounding (scaled up) - a diagram's place in the batch's layout can round differently.
+        assert len(vertices) == len(voronoiDiagram.vertices)
+        assert cKDTree(voronoiDiagram.vertexCoordinates()).query(vertices, p = np.inf)[0].max() <= 0.0001 * max(planeWidth, planeHeight)
+
+        siteIndices = {siteId: siteIndex for (siteIndex, siteId) in enumerate(voronoiDiagram.siteIds)}
+        for (siteIndex, siteId) in enumerate(voronoiDiagram.siteIds):
+            diagramNeighbors = sorted((siteIndices[edge.neighborSiteId] for edge in voronoiDiagram.voronoiRegions[siteId].edges))
+            assert sorted(edges[edges[:, 2] == siteIndex, 3].tolist()) == diagramNeighbors
+
+def test_batch_edges():
+    for diagramIndex in range(len(voronoiDiagramBatch)):
+        (points, vertices, edges) = voronoiDiagramBatch.diagramArrays(diagramIndex = diagramIndex)
+
+        # Edges index into their own diagram, grouped by site..
+        assert ((edges[:, :2] >= 0) & (edges[:, :2] < len(vertices))).all()
+        assert ((edges[:, 2:] >= 0) & (edges[:, 2:] < len(points))).all()
+        assert (np.diff(edges[:, 2]) >= 0).all()
+
+        # .. and each is in both its sites' regions.
+        assert sorted(map(tuple, edges[:, (0, 1, 2, 3)].tolist())) == sorted(map(tuple, edges[:, (0, 1, 3, 2)].tolist()))
+
+def test_batch_collinear_base_points():
+    collinearBatch = VoronoiDiagramBatch.build(basePointSets = (((0.25, 0.5), (0.5, 0.5), (0.75, 0.5)),), planeWidth = planeWidth, planeHeight = planeHeight)
+    (_, vertices, edges) = collinearBatch.diagramArrays(diagramIndex = 0)
+
+    # Two vertical ridges, top to bottom.
+    assert sorted(map(tuple, vertices.tolist())) == [(225, 0), (225, 400), (375, 0), (375, 400)]
+    assert len(edges) == 4
+
+def test_batch_too_few_base_points():
+    with raises(ValueError):
+        VoronoiDiagramBatch.build(basePointSets = (((0.1, 0.1), (0.5, 0.5), (0.9, 0.1)), ((0.1, 0.1), (0.5, 0.5))), planeWidth = planeWidth, planeHeight = planeHeight)
+
+def test_batch_base_points_outside_bounds():
+    with raises(ValueError):
+        VoronoiDiagramBatch.build(basePointSets = (((0.1, 0.1), (0.5, 1.5), (0.9, 0.1)),), planeWidth = planeWidth, planeHeight = planeHeight)
+
+def test_batch_duplicate_base_points():
+    # Duplicates only once rounded - and only within a diagram, as another diagram's sites can be anywhere.
+    with raises(ValueError):
+        VoronoiDiagramBatch.build(basePointSets = (((0.1, 0.1), (0.5, 0.5), (0.9, 0.1)), ((0.1, 0.1), (0.5, 0.5), (0.9, 0.1), (0.50001, 0.5))), planeWidth = planeWidth, planeHeight = planeHeight)
+
+    VoronoiDiagramBatch.build(basePointSets = (((0.1, 0.1), (0.5, 0.5), (0.9, 0.1)), ((0.1, 0.1), (0.5, 0.5), (0.9, 0.1))), planeWidth = planeWidth, planeHeight = planeHeight)
\ No newline at end of file
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from uuid import UUID
+
+from ..Point import Point
+from ..VoronoiDiagram import VoronoiDiagram
+
+from ..regions.VoronoiRegion import VoronoiRegion
+
+# What changed between two VoronoiDiagrams - only meaningful when the later one was built with previousDiagram = <the earlier one>, so that persisting IDs match.
+@dataclass(frozen=True)
+class VoronoiDiagramDiff:
+    # Added or moved points/vertices, added or re-edged regions.
+    points: dict[UUID, Point]
+    vertices: dict[UUID, Point]
+    voronoiRegions: dict[UUID, VoronoiRegion]
+
+    removedPointIds: tuple[UUID]
+    removedVertexIds: tuple[UUID]
+    removedRegionIds: tuple[UUID]
+
+    # Delaunay triangles as (pointId0, pointId1, pointId2) - a triangle is the same whatever order its points come in.
+    addedTriangles: tuple[tuple[UUID, UUID, UUID]]
+    removedTriangles: tuple[tuple[UUID, UUID, UUID]]
+
+    @staticmethod
+    def _changedPoints(previousPoints: dict[UUID, Point], currentPoints: dict[UUID, Point]) -> dict[UUID, Point]:
+        return {pointId: point for (pointId, point) in currentPoints.items() if pointId not in previousPoints or previousPoints[pointId] != point}
+
+    # A region's edges only change when its neighbors or vertex IDs do - moved vertices are covered by vertices. qhull can give the same edges in another order.
+    @staticmethod
+    def _regionEdgeIds(region: VoronoiRegion) -> frozenset[tuple[UUID, UUID, UUID]]:
+        return frozenset(((edge.vertex0Id, edge.vertex1Id, edge.neighborSiteId) for edge in region.edges))
+
+    @staticmethod
+    def _triangleIds(voronoiDiagram: VoronoiDiagram) -> dict[frozenset[UUID], tuple[UUID, UUID, UUID]]:
+        return {frozenset(triangleIds): triangleIds for triangleIds in (tuple((voronoiDiagram.siteIds[siteIndex] for siteIndex in triangle)) for triangle in voronoiDiagram.delaunayTriangles.tolist())}
+
+    @staticmethod
+    def between(previousDiagram: VoronoiDiagram, currentDiagram: VoronoiDiagram) -> VoronoiDiagramDiff:
+        previousRegions = previousDiagram.voronoiRegions
+
+        # np.float32 diagrams make their Points each time they're asked for - only once each here.
+        (previousPoints, previousVertices) = (previousDiagram.points, previousDiagram.vertices)
+        (currentPoints, currentVertices) = (currentDiagram.points, currentDiagram.vertices)
+
+        previousTriangles = VoronoiDiagramDiff._triangleIds(voronoiDiagram = previousDiagram)
+        currentTriangles = VoronoiDiagramDiff._triangleIds(voronoiDiagram = currentDiagram)
+        changedRegions = {regionId: region for (regionId, region) in currentDiagram.voronoiRegions.items() if regionId not in previousRegions or VoronoiDiagramDiff._regionEdgeIds(region = previousRegions[regionId]) != VoronoiDiagramDiff._regionEdgeIds(region = region)}
+
+        return VoronoiDiagramDiff(
+            points = VoronoiDiagramDiff._changedPoints(previousPoints = previousPoints, currentPoints = currentPoints),
+            vertices = VoronoiDiagramDiff._changedPoints(previousPoints = previousVertices, currentPoints = currentVertices),
+            voronoiRegions = changedRegions,
+            removedPointIds = tuple((pointId for pointId in previousPoints if pointId not in currentPoints)),
+            removedVertexIds = tuple((vertexId for vertexId in previousVertices if vertexId not in currentVertices)),
+            removedRegionIds = tuple((regionId for regionId in previousRegions if regionId not in currentDiagram.voronoiRegions)),
+            addedTriangles = tuple((triangleIds for (triangleKey, triangleIds) in currentTriangles.items() if triangleKey not in previousTriangles)),
+            removedTriangles = tuple((triangleIds for (triangleKey, triangleIds) in previousTriangles.items() if triangleKey not in currentTriangles))
+        )
+
+    def isEmpty(self) -> bool:
+        return not (self.points or self.vertices or self.voronoiRegions or self.removedPointIds or self.removedVertexIds or self.removedRegionIds or self.addedTriangles or self.removedTriangles)
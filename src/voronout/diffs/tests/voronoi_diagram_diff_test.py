@@ -0,0 +1,78 @@
+from ...Point import Point
+from ...VoronoiDiagram import VoronoiDiagram
+
+from ...jsonOut.VoronoiJSONEncoder import VoronoiJSONEncoder
+from ...regions.VoronoiRegion import VoronoiRegion
+
+from ..VoronoiDiagramDiff import VoronoiDiagramDiff
+
+from json import dumps, loads
+
+import numpy as np
+
+randomPoints = np.random.default_rng(seed = 28).uniform(low = 0.1, high = 0.9, size = (40, 2))
+framePoints = tuple((Point(x = randomX, y = randomY) for (randomX, randomY) in randomPoints))
+
+def test_diff_unchanged_frame():
+    previousDiagram = VoronoiDiagram(basePoints = framePoints, planeWidth = 600, planeHeight = 600)
+    currentDiagram = VoronoiDiagram(basePoints = framePoints, planeWidth = 600, planeHeight = 600, previousDiagram = previousDiagram)
+
+    # Every ID carries over, so nothing needs to be output.
+    assert currentDiagram.points.keys() == previousDiagram.points.keys()
+    assert currentDiagram.vertices.keys() == previousDiagram.vertices.keys()
+    assert VoronoiDiagramDiff.between(previousDiagram = previousDiagram, currentDiagram = currentDiagram).isEmpty()
+
+def test_diff_moved_site():
+    movedFramePoints = tuple((Point(x = framePoint.x + 0.001, y = framePoint.y) if framePointIndex == 0 else framePoint for (framePointIndex, framePoint) in enumerate(framePoints)))
+
+    previousDiagram = VoronoiDiagram(basePoints = framePoints, planeWidth = 600, planeHeight = 600)
+    currentDiagram = VoronoiDiagram(basePoints = movedFramePoints, planeWidth = 600, planeHeight = 600, previousDiagram = previousDiagram)
+
+    voronoiDiagramDiff = VoronoiDiagramDiff.between(previousDiagram = previousDiagram, currentDiagram = currentDiagram)
+
+    movedSiteId = currentDiagram.siteIds[0]
+    assert voronoiDiagramDiff.points == {movedSiteId: currentDiagram.points[movedSiteId]}
+
+    # Only the vertices around the moved site move - and they keep their IDs while doing so.
+    assert voronoiDiagramDiff.vertices
+    assert len(voronoiDiagramDiff.vertices) < len(currentDiagram.vertices) / 2
+    assert all((vertexId in previousDiagram.vertices for vertexId in voronoiDiagramDiff.vertices))
+
+    assert not voronoiDiagramDiff.removedPointIds
+    assert not voronoiDiagramDiff.removedVertexIds
+
+def _triangleIdSets(voronoiDiagram: VoronoiDiagram) -> set[frozenset]:
+    return set((frozenset((voronoiDiagram.siteIds[siteIndex] for siteIndex in triangle)) for triangle in voronoiDiagram.delaunayTriangles.tolist()))
+
+def test_diff_triangles():
+    # Far enough to change which sites neighbor it.
+    movedFramePoints = tuple((Point(x = 1 - framePoint.x, y = 1 - framePoint.y) if framePointIndex == 0 else framePoint for (framePointIndex, framePoint) in enumerate(framePoints)))
+
+    previousDiagram = VoronoiDiagram(basePoints = framePoints, planeWidth = 600, planeHeight = 600)
+    currentDiagram = VoronoiDiagram(basePoints = movedFramePoints, planeWidth = 600, planeHeight = 600, previousDiagram = previousDiagram)
+
+    voronoiDiagramDiff = VoronoiDiagramDiff.between(previousDiagram = previousDiagram, currentDiagram = currentDiagram)
+    assert voronoiDiagramDiff.addedTriangles and voronoiDiagramDiff.removedTriangles
+
+    # Applying the diff to the previous triangles gives the current ones.
+    diffedTriangles = (_triangleIdSets(voronoiDiagram = previousDiagram) - set(map(frozenset, voronoiDiagramDiff.removedTriangles))) | set(map(frozenset, voronoiDiagramDiff.addedTriangles))
+    assert diffedTriangles == _triangleIdSets(voronoiDiagram = currentDiagram)
+
+    deltaJson = loads(dumps(voronoiDiagramDiff, cls = VoronoiJSONEncoder))
+    assert set(map(frozenset, deltaJson['addedTriangles'])) == set((frozenset(map(str, triangleIds)) for triangleIds in voronoiDiagramDiff.addedTriangles))
+    assert len(deltaJson['removedTriangles']) == len(voronoiDiagramDiff.removedTriangles)
+
+def test_diff_reordered_diagram():
+    voronoiDiagram = VoronoiDiagram(basePoints = framePoints, planeWidth = 600, planeHeight = 600)
+
+    # The same edges and triangles, in another order - nothing changed.
+    reorderedDiagram = VoronoiDiagram.fromComponents(
+        points = voronoiDiagram.points,
+        vertices = voronoiDiagram.vertices,
+        voronoiRegions = {siteId: VoronoiRegion(siteId = siteId, edges = tuple(reversed(region.edges))) for (siteId, region) in voronoiDiagram.voronoiRegions.items()},
+        delaunayTriangles = voronoiDiagram.delaunayTriangles[::-1, ::-1],
+        planeWidth = 600,
+        planeHeight = 600
+    )
+
+    assert VoronoiDiagramDiff.between(previousDiagram = voronoiDiagram, currentDiagram = reorderedDiagram).isEmpty()
\ No newline at end of file
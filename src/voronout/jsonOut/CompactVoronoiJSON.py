@@ -0,0 +1,87 @@
+from itertools import chain
+from json import JSONEncoder
+from uuid import UUID, uuid4
+
+from ..Point import Point
+from ..VoronoiDiagram import VoronoiDiagram
+
+from ..edges.VoronoiEdge import VoronoiEdge
+from ..regions.VoronoiRegion import VoronoiRegion
+
+import numpy as np
+
+# boundValue keeps 4 decimal places, so scaling by this makes every coordinate an exact integer.
+coordinateScale = 10000
+
+# Coordinates are integers (x0, y0, x1, y1..) on the boundValue grid. Regions follow siteIds' order as flat (vertexIndex0, vertexIndex1, neighborSiteIndex..) lists.
+# With deltaEncode, each coordinate is stored as its difference from the previous point's - vertices are sorted first, so those differences stay small.
+class CompactVoronoiJSONEncoder(JSONEncoder):
+    def __init__(self, *, deltaEncode: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self._deltaEncode = deltaEncode
+
+    def _quantizePoints(self, pointCoordinates: np.ndarray) -> list[int]:
+        quantizedPoints = np.rint(pointCoordinates * coordinateScale).astype(np.int64)
+        if self._deltaEncode:
+            quantizedPoints = np.concatenate((quantizedPoints[:1], np.diff(quantizedPoints, axis = 0)))
+
+        return quantizedPoints.ravel().tolist()
+
+    def default(self, obj):
+        if isinstance(obj, VoronoiDiagram):
+            vertexCoordinates = obj.vertexCoordinates(dtype = np.float64)
+            vertexOrder = np.lexsort((vertexCoordinates[:, 0], vertexCoordinates[:, 1])) if self._deltaEncode else np.arange(len(vertexCoordinates))
+
+            vertexIndices = {obj.vertexIds[vertexOrderIndex]: vertexIndex for (vertexIndex, vertexOrderIndex) in enumerate(vertexOrder.tolist())}
+            siteIndices = {siteId: siteIndex for (siteIndex, siteId) in enumerate(obj.siteIds)}
+
+            return {
+                'planeWidth': obj.planeWidth,
+                'planeHeight': obj.planeHeight,
+                'originX': obj.originX,
+                'originY': obj.originY,
+                'window': obj.window,
+                'periodic': obj.periodic,
+                'coordinateDtype': np.dtype(obj.coordinateDtype).name,
+                'coordinateScale': coordinateScale,
+                'deltaEncoded': self._deltaEncode,
+                'points': self._quantizePoints(pointCoordinates = obj.pointCoordinates(dtype = np.float64)),
+                'vertices': self._quantizePoints(pointCoordinates = vertexCoordinates[vertexOrder]),
+                'regions': tuple((tuple(chain.from_iterable(((vertexIndices[edge.vertex0Id], vertexIndices[edge.vertex1Id], siteIndices[edge.neighborSiteId]) for edge in obj.voronoiRegions[siteId].edges))) for siteId in obj.siteIds)),
+                'triangles': obj.delaunayTriangles.ravel().tolist()
+            }
+        else:
+            return super().default(obj)
+
+def _dequantizePoints(quantizedPoints: list[int], deltaEncoded: bool) -> tuple[Point]:
+    pointCoordinates = np.array(quantizedPoints, dtype = np.int64).reshape(-1, 2)
+    if deltaEncoded:
+        pointCoordinates = np.cumsum(pointCoordinates, axis = 0)
+
+    return tuple((Point(x = x / coordinateScale, y = y / coordinateScale) for (x, y) in pointCoordinates.tolist()))
+
+def _makeVoronoiRegion(siteId: UUID, regionEdgeIndices: list[int], siteIds: tuple[UUID], vertexIds: tuple[UUID]) -> VoronoiRegion:
+    regionEdges = [VoronoiEdge(vertex0Id = vertexIds[regionEdgeIndices[edgeStart]], vertex1Id = vertexIds[regionEdgeIndices[edgeStart + 1]], neighborSiteId = siteIds[regionEdgeIndices[edgeStart + 2]]) for edgeStart in range(0, len(regionEdgeIndices), 3)]
+    return VoronoiRegion(siteId = siteId, edges = regionEdges)
+
+# IDs aren't part of the compact output, so the diagram gets new ones.
+def compactJsonToVoronoiDiagram(compactJson: dict) -> VoronoiDiagram:
+    points = _dequantizePoints(quantizedPoints = compactJson['points'], deltaEncoded = compactJson['deltaEncoded'])
+    vertices = _dequantizePoints(quantizedPoints = compactJson['vertices'], deltaEncoded = compactJson['deltaEncoded'])
+
+    siteIds = tuple((uuid4() for _ in points))
+    vertexIds = tuple((uuid4() for _ in vertices))
+
+    return VoronoiDiagram.fromComponents(
+        points = dict(zip(siteIds, points)),
+        vertices = dict(zip(vertexIds, vertices)),
+        voronoiRegions = {siteId: _makeVoronoiRegion(siteId = siteId, regionEdgeIndices = regionEdgeIndices, siteIds = siteIds, vertexIds = vertexIds) for (siteId, regionEdgeIndices) in zip(siteIds, compactJson['regions'])},
+        delaunayTriangles = np.array(compactJson['triangles'], dtype = np.intp).reshape(-1, 3),
+        planeWidth = compactJson['planeWidth'],
+        planeHeight = compactJson['planeHeight'],
+        originX = compactJson.get('originX', 0),
+        originY = compactJson.get('originY', 0),
+        window = tuple(compactJson['window']) if compactJson.get('window') else None,
+        periodic = compactJson.get('periodic', False),
+        coordinateDtype = np.dtype(compactJson.get('coordinateDtype', 'float64')).type
+    )
\ No newline at end of file
@@ -4,16 +4,37 @@ from uuid import UUID
 from ..Point import Point
 from ..VoronoiDiagram import VoronoiDiagram
 
+from ..diffs.VoronoiDiagramDiff import VoronoiDiagramDiff
+from ..regions.VoronoiRegion import VoronoiRegion
+
 class VoronoiJSONEncoder(JSONEncoder):
     def _handlePointDict(self, pointDict: dict[UUID, Point]) -> dict[str, dict[str, float]]:
         return {str(key): loadJSONString(repr(value)) for (key, value) in pointDict.items()}
     
+    def _handleRegionDict(self, regionDict: dict[UUID, VoronoiRegion]) -> tuple[dict]:
+        return tuple((loadJSONString(repr(region)) for (_, region) in regionDict.items()))
+
+    def _handleIds(self, ids: tuple[UUID]) -> tuple[str]:
+        return tuple((str(id) for id in ids))
+
     def default(self, obj):
         if isinstance(obj, VoronoiDiagram):
             return {
                 'points': self._handlePointDict(obj.points),
                 'vertices': self._handlePointDict(obj.vertices),
-                'regions': tuple((loadJSONString(repr(region)) for (_, region) in obj.voronoiRegions.items()))
+                'regions': self._handleRegionDict(obj.voronoiRegions),
+                'triangles': tuple((tuple((str(obj.siteIds[siteIndex]) for siteIndex in triangle)) for triangle in obj.delaunayTriangles))
+            }
+        elif isinstance(obj, VoronoiDiagramDiff):
+            return {
+                'points': self._handlePointDict(obj.points),
+                'vertices': self._handlePointDict(obj.vertices),
+                'regions': self._handleRegionDict(obj.voronoiRegions),
+                'removedPoints': self._handleIds(obj.removedPointIds),
+                'removedVertices': self._handleIds(obj.removedVertexIds),
+                'removedRegions': self._handleIds(obj.removedRegionIds),
+                'addedTriangles': tuple((self._handleIds(triangleIds) for triangleIds in obj.addedTriangles)),
+                'removedTriangles': tuple((self._handleIds(triangleIds) for triangleIds in obj.removedTriangles))
             }
         else:
             return super().default(obj)
\ No newline at end of file
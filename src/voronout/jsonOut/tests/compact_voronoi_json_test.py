@@ -0,0 +1,74 @@
+from ...Point import Point
+from ...VoronoiDiagram import VoronoiDiagram
+
+from ..CompactVoronoiJSON import CompactVoronoiJSONEncoder, compactJsonToVoronoiDiagram
+from ..VoronoiJSONEncoder import VoronoiJSONEncoder
+
+from json import dumps, loads
+
+import numpy as np
+import pytest
+
+randomPoints = np.random.default_rng(seed = 29).random((30, 2))
+testPoints = tuple((Point(x = randomX, y = randomY) for (randomX, randomY) in randomPoints))
+
+# Regions as (site, ((vertex0, vertex1, neighborSite)..)) coordinates - comparable across diagrams with different IDs.
+def _regionGeometry(voronoiDiagram: VoronoiDiagram) -> set:
+    return set(((voronoiDiagram.points[siteId], tuple(((voronoiDiagram.vertices[edge.vertex0Id], voronoiDiagram.vertices[edge.vertex1Id], voronoiDiagram.points[edge.neighborSiteId]) for edge in region.edges))) for (siteId, region) in voronoiDiagram.voronoiRegions.items()))
+
+@pytest.mark.parametrize("deltaEncode", [False, True])
+def test_compact_round_trip(deltaEncode: bool):
+    voronoiDiagram = VoronoiDiagram(basePoints = testPoints, planeWidth = 600, planeHeight = 400)
+
+    compactJson = loads(dumps(voronoiDiagram, cls = CompactVoronoiJSONEncoder, deltaEncode = deltaEncode))
+    assert all((isinstance(coordinate, int) for coordinate in compactJson['points'] + compactJson['vertices']))
+
+    readVoronoiDiagram = compactJsonToVoronoiDiagram(compactJson = compactJson)
+
+    assert tuple(readVoronoiDiagram.points.values()) == tuple(voronoiDiagram.points.values())
+    assert set(readVoronoiDiagram.vertices.values()) == set(voronoiDiagram.vertices.values())
+    assert _regionGeometry(voronoiDiagram = readVoronoiDiagram) == _regionGeometry(voronoiDiagram = voronoiDiagram)
+
+    np.testing.assert_array_equal(readVoronoiDiagram.delaunayTriangles, voronoiDiagram.delaunayTriangles)
+    assert (readVoronoiDiagram.planeWidth, readVoronoiDiagram.planeHeight) == (600, 400)
+
+def test_compact_smaller_than_default():
+    voronoiDiagram = VoronoiDiagram(basePoints = testPoints, planeWidth = 600, planeHeight = 400)
+
+    defaultJson = dumps(voronoiDiagram, cls = VoronoiJSONEncoder)
+    compactJson = dumps(voronoiDiagram, cls = CompactVoronoiJSONEncoder, deltaEncode = True, separators = (",", ":"))
+
+    assert len(compactJson) * 4 < len(defaultJson)
+
+def test_compact_round_trip_window():
+    voronoiDiagram = VoronoiDiagram(basePoints = testPoints, planeWidth = 600, planeHeight = 400, window = (0.25, 0.25, 0.75, 0.75))
+    readVoronoiDiagram = compactJsonToVoronoiDiagram(compactJson = loads(dumps(voronoiDiagram, cls = CompactVoronoiJSONEncoder)))
+
+    # The window still bounds what the read diagram's index finds.
+    assert readVoronoiDiagram.window == (0.25, 0.25, 0.75, 0.75)
+    assert readVoronoiDiagram.regionsInRect(x0 = 0, y0 = 0, x1 = 100, y1 = 50) == tuple()
+
+def test_compact_round_trip_periodic():
+    voronoiDiagram = VoronoiDiagram(basePoints = testPoints, planeWidth = 600, planeHeight = 400, periodic = True)
+    readVoronoiDiagram = compactJsonToVoronoiDiagram(compactJson = loads(dumps(voronoiDiagram, cls = CompactVoronoiJSONEncoder)))
+
+    assert readVoronoiDiagram.periodic
+
+    # Position queries still wrap around the plane's edges.
+    siteIndices = {siteId: siteIndex for (siteIndex, siteId) in enumerate(voronoiDiagram.siteIds)}
+    readSiteIndices = {siteId: siteIndex for (siteIndex, siteId) in enumerate(readVoronoiDiagram.siteIds)}
+
+    for (queryX, queryY) in ((1, 1), (599, 200), (300, 399), (-10, -10)):
+        assert readSiteIndices[readVoronoiDiagram.nearestRegion(x = queryX, y = queryY).siteId] == siteIndices[voronoiDiagram.nearestRegion(x = queryX, y = queryY).siteId]
+
+def test_compact_round_trip_float32():
+    voronoiDiagram = VoronoiDiagram(basePoints = testPoints, planeWidth = 600, planeHeight = 400, coordinateDtype = np.float32)
+    readVoronoiDiagram = compactJsonToVoronoiDiagram(compactJson = loads(dumps(voronoiDiagram, cls = CompactVoronoiJSONEncoder)))
+
+    # Still stored on the grid, without kept Points - and with the same coordinates.
+    assert readVoronoiDiagram.coordinateDtype == np.float32
+    assert readVoronoiDiagram._unitVertices.dtype == np.int32
+    assert readVoronoiDiagram.points is not readVoronoiDiagram.points
+
+    assert tuple(readVoronoiDiagram.points.values()) == tuple(voronoiDiagram.points.values())
+    assert _regionGeometry(voronoiDiagram = readVoronoiDiagram) == _regionGeometry(voronoiDiagram = voronoiDiagram)
\ No newline at end of file
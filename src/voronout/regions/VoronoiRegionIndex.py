@@ -0,0 +1,162 @@
+from math import ceil, floor, sqrt
+from uuid import UUID
+
+from scipy.spatial import cKDTree
+
+from ..Point import Point
+from .VoronoiRegion import VoronoiRegion
+
+import numpy as np
+
+# A uniform grid over the bounding boxes of a VoronoiDiagram's regions, sized for about one region per cell - so a rectangle query only looks at the cells it covers.
+class VoronoiRegionIndex:
+    # The plane runs from (originX, originY) to (originX + planeWidth, originY + planeHeight) - and, if periodic, wraps around.
+    # A windowed diagram only covers window = (x0, y0, x1, y1) of it, in the same coordinates - there are no regions outside that.
+    def __init__(self, points: dict[UUID, Point], vertices: dict[UUID, Point], voronoiRegions: dict[UUID, VoronoiRegion], planeWidth: float, planeHeight: float, originX: float = 0, originY: float = 0, periodic: bool = False, window: tuple[float, float, float, float] | None = None):
+        self._regions = tuple(voronoiRegions.values())
+
+        self._planeWidth = planeWidth
+        self._planeHeight = planeHeight
+
+        self._originX = originX
+        self._originY = originY
+
+        # (minX, minY, maxX, maxY) the regions cover.
+        self._extent = window or tuple((originX, originY, originX + planeWidth, originY + planeHeight))
+
+        regionSites = np.array(tuple((points[region.siteId] for region in self._regions)), dtype = np.float64).reshape(-1, 2)
+
+        # Regions are built in the unit square, then scaled - so on a plane that isn't square, the nearest site is the nearest in the unit square, not the plane.
+        # A periodic plane's sites are also nearest to points across its edges - boxsize wraps the tree's distances (needing sites in [0, 1)).
+        self._periodicBox = np.array((planeWidth, planeHeight), dtype = np.float64) if periodic else None
+        self._siteTree = cKDTree(self._toSiteTreeCoordinates(coordinates = regionSites), boxsize = 1 if periodic else None)
+
+        # (minX, minY, maxX, maxY) per region.
+        self._regionBoxes = np.array(tuple((self._makeRegionBox(region = region, vertices = vertices, site = regionSite) for (region, regionSite) in zip(self._regions, regionSites))), dtype = np.float64).reshape(-1, 4)
+
+        if periodic:
+            # A periodic region's box can run past the plane's edges - it's also inserted moved a plane over, so the part across each edge is found too.
+            (self._boxRegionIndices, self._regionBoxes) = self._wrapRegionBoxes(regionBoxes = self._regionBoxes)
+        else:
+            # Edges only run between ridge vertices, so a region's box also needs any corner of the extent inside it - which is the corner's nearest site's region.
+            (extentMinX, extentMinY, extentMaxX, extentMaxY) = self._extent
+            extentCorners = np.array(((extentMinX, extentMinY), (extentMaxX, extentMinY), (extentMinX, extentMaxY), (extentMaxX, extentMaxY)), dtype = np.float64)
+            for (extentCorner, cornerRegionIndex) in zip(extentCorners, self._siteTree.query(self._toSiteTreeCoordinates(coordinates = extentCorners))[1]):
+                self._regionBoxes[cornerRegionIndex, :2] = np.minimum(self._regionBoxes[cornerRegionIndex, :2], extentCorner)
+                self._regionBoxes[cornerRegionIndex, 2:] = np.maximum(self._regionBoxes[cornerRegionIndex, 2:], extentCorner)
+
+            self._boxRegionIndices = np.arange(len(self._regions))
+
+        self._gridSize = max(1, ceil(sqrt(len(self._regions))))
+
+        # { (cellX, cellY): [<index into _regionBoxes of a box that overlaps the cell>..] }
+        self._gridCells: dict[tuple[int, int], list[int]] = {}
+
+        for (boxIndex, (minX, minY, maxX, maxY)) in enumerate(self._regionBoxes.tolist()):
+            (minCellX, minCellY, maxCellX, maxCellY) = self._findCellRange(minX = minX, minY = minY, maxX = maxX, maxY = maxY)
+            for cellX in range(minCellX, maxCellX + 1):
+                for cellY in range(minCellY, maxCellY + 1):
+                    self._gridCells.setdefault((cellX, cellY), []).append(boxIndex)
+
+    def _toSiteTreeCoordinates(self, coordinates: np.ndarray) -> np.ndarray:
+        unitCoordinates = (coordinates - (self._originX, self._originY)) / (self._planeWidth, self._planeHeight)
+        return unitCoordinates if self._periodicBox is None else np.mod(unitCoordinates, 1)
+
+    def _makeRegionBox(self, region: VoronoiRegion, vertices: dict[UUID, Point], site: np.ndarray) -> tuple[float, float, float, float]:
+        regionVertices = np.array(tuple((vertices[edgeVertexId] for edge in region.edges for edgeVertexId in (edge.vertex0Id, edge.vertex1Id))), dtype = np.float64).reshape(-1, 2)
+
+        # Periodic vertices are wrapped into the plane - each is taken back to its image nearest the site, which is the one on the region.
+        if self._periodicBox is not None:
+            regionVertices = site + np.mod(regionVertices - site + (self._periodicBox / 2), self._periodicBox) - (self._periodicBox / 2)
+
+        regionCoordinates = np.vstack((regionVertices, site))
+        return tuple((*regionCoordinates.min(axis = 0).tolist(), *regionCoordinates.max(axis = 0).tolist()))
+
+    # Returns (<region index of each box>, <boxes>) - regionBoxes, plus each moved by a plane's width and/or height wherever that still overlaps the plane.
+    def _wrapRegionBoxes(self, regionBoxes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        (planeMinX, planeMinY, planeMaxX, planeMaxY) = self._extent
+
+        boxRegionIndices = []
+        wrappedBoxes = []
+
+        for shiftX in (0, -self._planeWidth, self._planeWidth):
+            for shiftY in (0, -self._planeHeight, self._planeHeight):
+                shiftedBoxes = regionBoxes + (shiftX, shiftY, shiftX, shiftY)
+                shiftedBoxesOverlap = (shiftedBoxes[:, 0] <= planeMaxX) & (shiftedBoxes[:, 2] >= planeMinX) & (shiftedBoxes[:, 1] <= planeMaxY) & (shiftedBoxes[:, 3] >= planeMinY)
+
+                boxRegionIndices.append(np.flatnonzero(shiftedBoxesOverlap))
+                wrappedBoxes.append(shiftedBoxes[shiftedBoxesOverlap])
+
+        return np.concatenate(boxRegionIndices), np.concatenate(wrappedBoxes)
+
+    # (min, max) wrapped onto (planeMin, planeMin + planeDimension) - as one interval, or two if it crosses the plane's edge.
+    @staticmethod
+    def _wrapInterval(minValue: float, maxValue: float, planeMin: float, planeDimension: float) -> tuple[tuple[float, float]]:
+        if maxValue - minValue >= planeDimension:
+            return tuple(((planeMin, planeMin + planeDimension),))
+
+        planeShift = floor((minValue - planeMin) / planeDimension) * planeDimension
+        (wrappedMin, wrappedMax) = tuple((minValue - planeShift, maxValue - planeShift))
+
+        if wrappedMax <= planeMin + planeDimension:
+            return tuple(((wrappedMin, wrappedMax),))
+
+        return tuple(((wrappedMin, planeMin + planeDimension), (planeMin, wrappedMax - planeDimension)))
+
+    def _findCell(self, coordinate: float, extentMin: float, extentMax: float) -> int:
+        return min(max(floor((coordinate - extentMin) / (extentMax - extentMin) * self._gridSize), 0), self._gridSize - 1)
+
+    def _findCellRange(self, minX: float, minY: float, maxX: float, maxY: float) -> tuple[int, int, int, int]:
+        (extentMinX, extentMinY, extentMaxX, extentMaxY) = self._extent
+
+        return tuple((
+            self._findCell(coordinate = minX, extentMin = extentMinX, extentMax = extentMaxX),
+            self._findCell(coordinate = minY, extentMin = extentMinY, extentMax = extentMaxY),
+            self._findCell(coordinate = maxX, extentMin = extentMinX, extentMax = extentMaxX),
+            self._findCell(coordinate = maxY, extentMin = extentMinY, extentMax = extentMaxY)
+        ))
+
+    def _extentContains(self, x: float, y: float) -> bool:
+        (extentMinX, extentMinY, extentMaxX, extentMaxY) = self._extent
+        return extentMinX <= x <= extentMaxX and extentMinY <= y <= extentMaxY
+
+    # Regions whose bounding boxes intersect the rectangle (x0, y0) -> (x1, y1), in the order VoronoiDiagram.voronoiRegions has them.
+    def regionsInRect(self, x0: float, y0: float, x1: float, y1: float) -> tuple[VoronoiRegion]:
+        (minX, maxX) = sorted((x0, x1))
+        (minY, maxY) = sorted((y0, y1))
+
+        # A periodic plane repeats forever, so the rectangle is wrapped onto it - in up to four pieces.
+        if self._periodicBox is not None:
+            queryRects = tuple(((rectMinX, rectMinY, rectMaxX, rectMaxY) for (rectMinX, rectMaxX) in self._wrapInterval(minValue = minX, maxValue = maxX, planeMin = self._originX, planeDimension = self._planeWidth) for (rectMinY, rectMaxY) in self._wrapInterval(minValue = minY, maxValue = maxY, planeMin = self._originY, planeDimension = self._planeHeight)))
+        else:
+            (extentMinX, extentMinY, extentMaxX, extentMaxY) = self._extent
+            if maxX < extentMinX or maxY < extentMinY or minX > extentMaxX or minY > extentMaxY:
+                return tuple()
+
+            queryRects = tuple(((minX, minY, maxX, maxY),))
+
+        foundRegionIndices = set()
+
+        for (rectMinX, rectMinY, rectMaxX, rectMaxY) in queryRects:
+            (minCellX, minCellY, maxCellX, maxCellY) = self._findCellRange(minX = rectMinX, minY = rectMinY, maxX = rectMaxX, maxY = rectMaxY)
+
+            candidateBoxIndices = set()
+            for cellX in range(minCellX, maxCellX + 1):
+                for cellY in range(minCellY, maxCellY + 1):
+                    candidateBoxIndices.update(self._gridCells.get((cellX, cellY), ()))
+
+            candidateBoxIndices = np.array(tuple(candidateBoxIndices), dtype = np.intp)
+            candidateBoxes = self._regionBoxes[candidateBoxIndices]
+
+            candidatesIntersect = (candidateBoxes[:, 0] <= rectMaxX) & (candidateBoxes[:, 2] >= rectMinX) & (candidateBoxes[:, 1] <= rectMaxY) & (candidateBoxes[:, 3] >= rectMinY)
+            foundRegionIndices.update(self._boxRegionIndices[candidateBoxIndices[candidatesIntersect]].tolist())
+
+        return tuple((self._regions[regionIndex] for regionIndex in sorted(foundRegionIndices)))
+
+    # Every point in a Voronoi region is closest to that region's site, so the nearest region is the nearest site's. None outside the extent, where there are no regions.
+    def nearestRegion(self, x: float, y: float) -> VoronoiRegion | None:
+        if self._periodicBox is None and not self._extentContains(x = x, y = y):
+            return None
+
+        (_, nearestRegionIndex) = self._siteTree.query(self._toSiteTreeCoordinates(coordinates = np.array((x, y), dtype = np.float64)))
+        return self._regions[nearestRegionIndex]
\ No newline at end of file
@@ -0,0 +1,439 @@
+from ..Point import Point
+from ..VoronoiDiagram import VoronoiDiagram
+
+from ..batches.VoronoiDiagramBatch import VoronoiDiagramBatch
+
+from ..jsonOut.CompactVoronoiJSON import CompactVoronoiJSONEncoder, compactJsonToVoronoiDiagram
+
+from functools import cache
+from json import dumps, loads
+from pytest import mark, param
+from scipy.spatial import cKDTree
+from time import perf_counter
+
+import gc
+import numpy as np
+import os
+import tracemalloc
+
+# Randomized differential tests: every way of getting a diagram must give the regions an independent half-plane clipping does, and every exact transformation
+# of the reference path - VoronoiDiagram as built by default - what it does.
+# A unit plane keeps coordinates in basePoints' terms, so they only differ by boundValue's rounding.
+planeWidth = 1
+planeHeight = 1
+
+boundValueTolerance = 0.0001 + 1e-9
+
+# A diagram's place in a batch's layout can round each of its x and y a step away from a lone diagram's.
+batchTolerance = np.sqrt(2) * boundValueTolerance
+
+# Merging nearly cocircular sites' vertices moves each up to prepareBasePoints' merge radius (0.0001) to its group's first - then both round.
+mergeTolerance = 0.0001 + (np.sqrt(2) * boundValueTolerance)
+
+distributions = tuple(("uniform", "clustered", "gridSnapped"))
+numsSites = tuple((10, 50, 200))
+seeds = tuple((0, 1, 2))
+
+# { path: { numSites: (<seconds>, <peak bytes>) } } a path may take to build, with room to spare - a path that blows through them has regressed,
+# even if it has done so at every size alike.
+buildBudgets = {
+    "reference": {50: tuple((0.06, 384 * 1024)), 200: tuple((0.15, 1536 * 1024))},
+    "wholePlaneWindow": {250: tuple((0.08, 1536 * 1024)), 1000: tuple((0.2, 6 * 1024 * 1024))},
+    "periodic": {250: tuple((0.08, 2560 * 1024)), 1000: tuple((0.25, 8 * 1024 * 1024))},
+    "batch": {250: tuple((0.03, 2560 * 1024)), 1000: tuple((0.12, 10 * 1024 * 1024))}
+}
+
+# { path: <seconds> } numBudgetQueries index queries may take, at any size.
+queryBudgets = {
+    "wholePlaneWindow": 0.08,
+    "periodic": 0.1
+}
+
+# Budgets also scale: going from each path's smaller size to its larger (4x the sites), builds should take at most buildTimeScaling times as long
+# and peak at buildMemoryScaling times the memory (n log n, with room for noise), and index queries queryTimeScaling times as long (constant).
+budgetNumsSites = {path: min(pathBudgets.keys()) for (path, pathBudgets) in buildBudgets.items()}
+
+buildTimeScaling = 8
+buildMemoryScaling = 6
+queryTimeScaling = 2
+
+numBudgetQueries = 500
+
+# Each regionsInRect query covers about this many regions' area - so it finds as many at any size, leaving only the index's own cost to scale.
+queryRectRegions = 4
+
+# Wall-clock times are only comparable on a quiet machine - skip them where CI is set.
+timingBudget = mark.skipif(bool(os.environ.get("CI")), reason = "wall-clock timings are too noisy on shared CI runners")
+
+def _makeBasePoints(distribution: str, numSites: int, seed: int) -> tuple[Point]:
+    rng = np.random.default_rng(seed = (seed * 1000) + numSites)
+
+    match distribution:
+        case "uniform":
+            baseCoordinates = rng.random((numSites, 2))
+        case "clustered":
+            clusterCenters = rng.random((max(1, numSites // 20), 2))
+            baseCoordinates = clusterCenters[rng.integers(len(clusterCenters), size = numSites)] + rng.normal(scale = 0.03, size = (numSites, 2))
+        case "gridSnapped":
+            # Near, but not on, a lattice - almost cocircular sites, and vertices close to each other and the plane's edges.
+            gridSize = int(np.ceil(np.sqrt(numSites))) + 1
+            baseCoordinates = (rng.integers(0, gridSize + 1, size = (numSites, 2)) / gridSize) + rng.uniform(-0.002, 0.002, size = (numSites, 2))
+
+    baseCoordinates = np.unique(np.round(np.clip(baseCoordinates, 0, 1), 4), axis = 0)
+    return tuple((Point(x = baseX, y = baseY) for (baseX, baseY) in baseCoordinates.tolist()))
+
+# Ground truth independent of scipy: the unit square cut down by the half-plane nearer siteIndex's site than each other site, nearest first -
+# stopping once the rest are too far off to cut it. (<polygon's vertices>, { <neighbor site index>: <length of the edge shared with it> }).
+def _makeTruthRegion(siteIndex: int, sites: np.ndarray) -> tuple[np.ndarray, dict[int, float]]:
+    site = sites[siteIndex]
+
+    # Edge i runs from polygon[i] to polygon[i + 1] along edgeNeighbors[i]'s bisector - or the plane's edge, at -1.
+    polygon = np.array(((0, 0), (1, 0), (1, 1), (0, 1)), dtype = np.float64)
+    edgeNeighbors = [-1, -1, -1, -1]
+
+    siteDistances = np.hypot(*(sites - site).T)
+    for neighborIndex in np.argsort(siteDistances).tolist():
+        if neighborIndex == siteIndex:
+            continue
+        if siteDistances[neighborIndex] / 2 > np.hypot(*(polygon - site).T).max():
+            break
+
+        neighborSite = sites[neighborIndex]
+        bisectorNormal = neighborSite - site
+        # > 0 past the bisector, nearer the neighbor.
+        vertexSides = (polygon @ bisectorNormal) - (bisectorNormal @ ((site + neighborSite) / 2))
+
+        if (vertexSides <= 0).all():
+            continue
+
+        clippedPolygon = []
+        clippedEdgeNeighbors = []
+
+        for vertexIndex in range(len(polygon)):
+            nextVertexIndex = (vertexIndex + 1) % len(polygon)
+            (vertex, nextVertex) = (polygon[vertexIndex], polygon[nextVertexIndex])
+            (vertexSide, nextVertexSide) = (vertexSides[vertexIndex], vertexSides[nextVertexIndex])
+
+            if vertexSide <= 0:
+                clippedPolygon.append(vertex)
+                clippedEdgeNeighbors.append(edgeNeighbors[vertexIndex])
+
+                # Leaving the region - the bisector runs from here to where the polygon comes back in.
+                if nextVertexSide > 0:
+                    clippedPolygon.append(vertex + ((nextVertex - vertex) * (vertexSide / (vertexSide - nextVertexSide))))
+                    clippedEdgeNeighbors.append(neighborIndex)
+            elif nextVertexSide <= 0:
+                clippedPolygon.append(vertex + ((nextVertex - vertex) * (vertexSide / (vertexSide - nextVertexSide))))
+                clippedEdgeNeighbors.append(edgeNeighbors[vertexIndex])
+
+        polygon = np.array(clippedPolygon)
+        edgeNeighbors = clippedEdgeNeighbors
+
+    neighborEdgeLengths = {}
+    for (vertexIndex, neighborIndex) in enumerate(edgeNeighbors):
+        if neighborIndex != -1:
+            neighborEdgeLengths[neighborIndex] = neighborEdgeLengths.get(neighborIndex, 0) + np.hypot(*(polygon[(vertexIndex + 1) % len(polygon)] - polygon[vertexIndex]))
+
+    return polygon, neighborEdgeLengths
+
+# Each region, given as (<neighbor site indices>, <vertices>) for each of sites, should be the truth's:
+# - sharing an edge with every site the truth's does, for more than rounding's length
+# - sharing one with no site whose bisector misses the truth's region by more than tolerance
+# - with vertices on the truth's, and the truth's vertices off the plane's corners among them.
+def _assertMatchesTruth(basePoints: tuple[Point], sites: np.ndarray, regions: list[tuple[frozenset[int], np.ndarray]], tolerance: float):
+    truthSites = np.array(basePoints, dtype = np.float64).reshape(-1, 2)
+
+    # Diagrams may order (and, merging duplicates, number) sites their own way - match them to basePoints' by coordinates.
+    (truthSiteDistances, truthSiteIndices) = cKDTree(truthSites).query(sites)
+    assert truthSiteDistances.max() <= tolerance
+
+    planeCorners = np.array(((0, 0), (1, 0), (1, 1), (0, 1)), dtype = np.float64)
+
+    for (siteIndex, (regionNeighbors, regionVertices)) in enumerate(regions):
+        truthSiteIndex = truthSiteIndices[siteIndex]
+        (truthPolygon, truthNeighborEdgeLengths) = _makeTruthRegion(siteIndex = truthSiteIndex, sites = truthSites)
+
+        neighbors = frozenset((truthSiteIndices[neighborIndex] for neighborIndex in regionNeighbors))
+        requiredNeighbors = frozenset((neighborIndex for (neighborIndex, edgeLength) in truthNeighborEdgeLengths.items() if edgeLength > tolerance))
+
+        # How much nearer each site is than siteIndex's at the truth region's closest vertex - 0 along a shared edge.
+        polygonSiteDistances = np.hypot(*(truthPolygon[:, None, :] - truthSites[None, :, :]).transpose(2, 0, 1))
+        bisectorGaps = (polygonSiteDistances - polygonSiteDistances[:, [truthSiteIndex]]).min(axis = 0)
+
+        assert requiredNeighbors <= neighbors, f"site {truthSiteIndex} misses neighbors {set(requiredNeighbors - neighbors)}"
+        assert all((bisectorGaps[neighborIndex] <= tolerance for neighborIndex in neighbors)), f"site {truthSiteIndex} has neighbors {set((neighborIndex for neighborIndex in neighbors if bisectorGaps[neighborIndex] > tolerance))} it doesn't touch"
+
+        assert len(regionVertices)
+        assert cKDTree(truthPolygon).query(regionVertices)[0].max() <= tolerance
+
+        truthInnerVertices = truthPolygon[~(np.abs(truthPolygon[:, None, :] - planeCorners[None, :, :]).max(axis = 2) <= tolerance).any(axis = 1)]
+        if len(truthInnerVertices):
+            assert cKDTree(regionVertices).query(truthInnerVertices)[0].max() <= tolerance
+
+def _makeReferenceDiagram(basePoints: tuple[Point]) -> VoronoiDiagram:
+    return VoronoiDiagram(basePoints = basePoints, planeWidth = planeWidth, planeHeight = planeHeight)
+
+# Each case's reference diagram is compared against several paths - build it once.
+@cache
+def _getReferenceDiagram(distribution: str, numSites: int, seed: int) -> VoronoiDiagram:
+    return _makeReferenceDiagram(basePoints = _makeBasePoints(distribution = distribution, numSites = numSites, seed = seed))
+
+# (<points, in siteIds' order>, <vertices>, [(<neighbor site indices>, <vertices>) for each region, in siteIds' order]) - comparable across diagrams with different IDs.
+# Neighbors are only those sharing an edge at least minEdgeLength long.
+def _summarizeDiagram(voronoiDiagram: VoronoiDiagram, minEdgeLength: float = 0) -> tuple[np.ndarray, np.ndarray, list[tuple[frozenset[int], np.ndarray]]]:
+    siteIndices = {siteId: siteIndex for (siteIndex, siteId) in enumerate(voronoiDiagram.siteIds)}
+    regionSummaries = []
+
+    # np.float32 diagrams make their Points each time they're asked for - only once here.
+    (points, vertices) = (voronoiDiagram.points, voronoiDiagram.vertices)
+
+    for siteId in voronoiDiagram.siteIds:
+        regionEdges = voronoiDiagram.voronoiRegions[siteId].edges
+
+        regionNeighbors = frozenset((siteIndices[edge.neighborSiteId] for edge in regionEdges if Point.distance(p1 = vertices[edge.vertex0Id], p2 = vertices[edge.vertex1Id]) >= minEdgeLength))
+        regionVertices = np.array(tuple((vertices[vertexId] for edge in regionEdges for vertexId in (edge.vertex0Id, edge.vertex1Id))), dtype = np.float64).reshape(-1, 2)
+
+        regionSummaries.append(tuple((regionNeighbors, regionVertices)))
+
+    siteCoordinates = np.array(tuple((points[siteId] for siteId in voronoiDiagram.siteIds)), dtype = np.float64).reshape(-1, 2)
+    vertexCoordinates = np.array(tuple(vertices.values()), dtype = np.float64).reshape(-1, 2)
+
+    return siteCoordinates, vertexCoordinates, regionSummaries
+
+# Every coordinate in each has one in the other within tolerance.
+def _assertSameCoordinates(coordinates: np.ndarray, otherCoordinates: np.ndarray, tolerance: float):
+    assert (len(coordinates) == 0) == (len(otherCoordinates) == 0)
+
+    if len(coordinates):
+        assert cKDTree(coordinates).query(otherCoordinates)[0].max() <= tolerance
+        assert cKDTree(otherCoordinates).query(coordinates)[0].max() <= tolerance
+
+def _assertDiagramsMatch(referenceDiagram: VoronoiDiagram, candidateDiagram: VoronoiDiagram, tolerance: float = boundValueTolerance, minEdgeLength: float = 0):
+    (referenceSites, referenceVertices, referenceRegions) = _summarizeDiagram(voronoiDiagram = referenceDiagram, minEdgeLength = minEdgeLength)
+    (candidateSites, candidateVertices, candidateRegions) = _summarizeDiagram(voronoiDiagram = candidateDiagram, minEdgeLength = minEdgeLength)
+
+    assert referenceSites.shape == candidateSites.shape
+    assert np.abs(referenceSites - candidateSites).max() <= tolerance
+
+    _assertSameCoordinates(coordinates = referenceVertices, otherCoordinates = candidateVertices, tolerance = tolerance)
+
+    for ((referenceNeighbors, referenceRegionVertices), (candidateNeighbors, candidateRegionVertices)) in zip(referenceRegions, candidateRegions):
+        assert referenceNeighbors == candidateNeighbors
+        _assertSameCoordinates(coordinates = referenceRegionVertices, otherCoordinates = candidateRegionVertices, tolerance = tolerance)
+
+basePointCases = tuple(((distribution, numSites, seed) for distribution in distributions for numSites in numsSites for seed in seeds))
+
+@mark.parametrize("distribution,numSites,seed", basePointCases)
+def test_oracle_rescaled(distribution: str, numSites: int, seed: int):
+    referenceDiagram = _getReferenceDiagram(distribution = distribution, numSites = numSites, seed = seed)
+    rescaledDiagram = referenceDiagram.rescaled(planeWidth = 1920, planeHeight = 1080, originX = 10, originY = 20).rescaled(planeWidth = planeWidth, planeHeight = planeHeight)
+
+    _assertDiagramsMatch(referenceDiagram = referenceDiagram, candidateDiagram = rescaledDiagram)
+
+@mark.parametrize("distribution,numSites,seed", basePointCases)
+@mark.parametrize("deltaEncode", (False, True))
+def test_oracle_compact_json(distribution: str, numSites: int, seed: int, deltaEncode: bool):
+    referenceDiagram = _getReferenceDiagram(distribution = distribution, numSites = numSites, seed = seed)
+    compactDiagram = compactJsonToVoronoiDiagram(compactJson = loads(dumps(referenceDiagram, cls = CompactVoronoiJSONEncoder, deltaEncode = deltaEncode)))
+
+    _assertDiagramsMatch(referenceDiagram = referenceDiagram, candidateDiagram = compactDiagram)
+
+@mark.parametrize("distribution,numSites,seed", basePointCases)
+def test_oracle_float32(distribution: str, numSites: int, seed: int):
+    basePoints = _makeBasePoints(distribution = distribution, numSites = numSites, seed = seed)
+    float32Diagram = VoronoiDiagram(basePoints = basePoints, planeWidth = planeWidth, planeHeight = planeHeight, coordinateDtype = np.float32)
+
+    _assertDiagramsMatch(referenceDiagram = _getReferenceDiagram(distribution = distribution, numSites = numSites, seed = seed), candidateDiagram = float32Diagram)
+
+@mark.parametrize("distribution,numSites,seed", basePointCases)
+def test_oracle_prepared_base_points(distribution: str, numSites: int, seed: int):
+    basePoints = _makeBasePoints(distribution = distribution, numSites = numSites, seed = seed)
+
+    # Duplicates are merged into the sites they duplicate, leaving the reference's sites.
+    preparedDiagram = VoronoiDiagram(basePoints = basePoints + basePoints[:3], planeWidth = planeWidth, planeHeight = planeHeight, prepareBasePoints = True)
+
+    # Merging nearly cocircular sites' vertices drops the edges between them, too short for boundValue to keep.
+    _assertDiagramsMatch(referenceDiagram = _getReferenceDiagram(distribution = distribution, numSites = numSites, seed = seed), candidateDiagram = preparedDiagram, tolerance = mergeTolerance, minEdgeLength = boundValueTolerance)
+
+@mark.parametrize("distribution,numSites,seed", basePointCases)
+def test_oracle_previous_diagram(distribution: str, numSites: int, seed: int):
+    basePoints = _makeBasePoints(distribution = distribution, numSites = numSites, seed = seed)
+
+    referenceDiagram = _getReferenceDiagram(distribution = distribution, numSites = numSites, seed = seed)
+    rebuiltDiagram = VoronoiDiagram(basePoints = basePoints, planeWidth = planeWidth, planeHeight = planeHeight, previousDiagram = referenceDiagram)
+
+    _assertDiagramsMatch(referenceDiagram = referenceDiagram, candidateDiagram = rebuiltDiagram)
+
+    # Nothing moved, so every ID persists.
+    assert rebuiltDiagram.vertices.keys() == referenceDiagram.vertices.keys()
+
+# Both sites and vertices are boundValue-rounded, each up to half of boundValueTolerance off in x and y.
+truthTolerance = 2 * boundValueTolerance
+
+# The reference path extends ridges to the plane's edges with Boundary, which doesn't clip them where they cross the plane's edges:
+# vertices there land up to ~0.75 off, and regions gain neighbors they never touch. Windows clip exactly, so a whole-plane one gives the truth.
+boundaryClippingDefect = mark.xfail(strict = True, reason = "Boundary-clipped ridges end off the plane's edges, with neighbors the regions don't touch")
+
+truthPaths = tuple((
+    param("reference", marks = boundaryClippingDefect),
+    param("preparedBasePoints", marks = boundaryClippingDefect),
+    "wholePlaneWindow",
+    "preparedBasePointsWholePlaneWindow"
+))
+
+def _makePathDiagram(path: str, distribution: str, numSites: int, seed: int) -> VoronoiDiagram:
+    basePoints = _makeBasePoints(distribution = distribution, numSites = numSites, seed = seed)
+
+    match path:
+        case "reference":
+            return _getReferenceDiagram(distribution = distribution, numSites = numSites, seed = seed)
+        case "preparedBasePoints":
+            return VoronoiDiagram(basePoints = basePoints + basePoints[:3], planeWidth = planeWidth, planeHeight = planeHeight, prepareBasePoints = True)
+        case "wholePlaneWindow":
+            return VoronoiDiagram(basePoints = basePoints, planeWidth = planeWidth, planeHeight = planeHeight, window = (0, 0, 1, 1))
+        case "preparedBasePointsWholePlaneWindow":
+            return VoronoiDiagram(basePoints = basePoints + basePoints[:3], planeWidth = planeWidth, planeHeight = planeHeight, prepareBasePoints = True, window = (0, 0, 1, 1))
+
+@mark.parametrize("path", truthPaths)
+@mark.parametrize("distribution,numSites,seed", basePointCases)
+def test_oracle_truth(distribution: str, numSites: int, seed: int, path: str):
+    pathDiagram = _makePathDiagram(path = path, distribution = distribution, numSites = numSites, seed = seed)
+    (pathSites, _, pathRegions) = _summarizeDiagram(voronoiDiagram = pathDiagram)
+
+    _assertMatchesTruth(basePoints = _makeBasePoints(distribution = distribution, numSites = numSites, seed = seed), sites = pathSites, regions = pathRegions, tolerance = truthTolerance)
+
+# A batch clips like a whole-plane window, so its diagrams should be the window's - and the truth.
+@mark.parametrize("distribution", distributions)
+@mark.parametrize("numSites", numsSites)
+def test_oracle_batch(distribution: str, numSites: int):
+    basePointSets = tuple((_makeBasePoints(distribution = distribution, numSites = numSites, seed = seed) for seed in seeds))
+    voronoiDiagramBatch = VoronoiDiagramBatch.build(basePointSets = basePointSets, planeWidth = planeWidth, planeHeight = planeHeight)
+
+    for (diagramIndex, basePoints) in enumerate(basePointSets):
+        windowDiagram = VoronoiDiagram(basePoints = basePoints, planeWidth = planeWidth, planeHeight = planeHeight, window = (0, 0, 1, 1))
+        (windowSites, windowVertices, windowRegions) = _summarizeDiagram(voronoiDiagram = windowDiagram)
+
+        (batchSites, batchVertices, batchEdges) = voronoiDiagramBatch.diagramArrays(diagramIndex = diagramIndex)
+
+        assert np.abs(windowSites - batchSites).max() <= batchTolerance
+        _assertSameCoordinates(coordinates = windowVertices, otherCoordinates = batchVertices, tolerance = batchTolerance)
+
+        batchRegions = []
+        for (siteIndex, (windowNeighbors, windowRegionVertices)) in enumerate(windowRegions):
+            siteEdges = batchEdges[batchEdges[:, 2] == siteIndex]
+            batchRegions.append(tuple((frozenset(siteEdges[:, 3].tolist()), batchVertices[siteEdges[:, :2].ravel()])))
+
+            assert windowNeighbors == frozenset(siteEdges[:, 3].tolist())
+            _assertSameCoordinates(coordinates = windowRegionVertices, otherCoordinates = batchVertices[siteEdges[:, :2].ravel()], tolerance = batchTolerance)
+
+        _assertMatchesTruth(basePoints = basePoints, sites = batchSites, regions = batchRegions, tolerance = truthTolerance)
+
+def _makeBudgetBuild(path: str, numSites: int):
+    basePointSets = tuple((_makeBasePoints(distribution = "uniform", numSites = numSites, seed = seed) for seed in seeds))
+
+    match path:
+        case "reference":
+            return lambda: _makeReferenceDiagram(basePoints = basePointSets[0])
+        case "wholePlaneWindow":
+            return lambda: VoronoiDiagram(basePoints = basePointSets[0], planeWidth = planeWidth, planeHeight = planeHeight, window = (0, 0, 1, 1))
+        case "periodic":
+            return lambda: VoronoiDiagram(basePoints = basePointSets[0], planeWidth = planeWidth, planeHeight = planeHeight, periodic = True)
+        case "batch":
+            return lambda: VoronoiDiagramBatch.build(basePointSets = basePointSets, planeWidth = planeWidth, planeHeight = planeHeight)
+
+# Best of several runs - the least disturbed by whatever else the machine is doing.
+def _bestTime(run, repeats: int = 5) -> float:
+    runTimes = []
+
+    for _ in range(repeats):
+        runStart = perf_counter()
+        run()
+        runTimes.append(perf_counter() - runStart)
+
+    return min(runTimes)
+
+def _peakMemory(run) -> int:
+    tracemalloc.start()
+    try:
+        run()
+        (_, peakMemory) = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peakMemory
+
+@timingBudget
+@mark.parametrize("path", tuple(buildBudgets.keys()))
+def test_oracle_build_time_budget(path: str):
+    numSites = budgetNumsSites[path]
+    (buildTime, scaledBuildTime) = tuple((_bestTime(run = _makeBudgetBuild(path = path, numSites = budgetSites)) for budgetSites in (numSites, 4 * numSites)))
+
+    for (budgetSites, budgetBuildTime) in ((numSites, buildTime), (4 * numSites, scaledBuildTime)):
+        (timeBudget, _) = buildBudgets[path][budgetSites]
+        assert budgetBuildTime <= timeBudget, f"{path} took {budgetBuildTime:.3f}s for {budgetSites} sites, over the {timeBudget}s budget"
+
+    assert scaledBuildTime <= buildTimeScaling * buildTime, f"{path} took {scaledBuildTime:.3f}s for {4 * numSites} sites, over {buildTimeScaling}x its {buildTime:.3f}s for {numSites}"
+
+# tracemalloc counts allocations rather than time, so these run anywhere.
+@mark.parametrize("path", tuple(buildBudgets.keys()))
+def test_oracle_build_memory_budget(path: str):
+    numSites = budgetNumsSites[path]
+    (buildMemory, scaledBuildMemory) = tuple((_peakMemory(run = _makeBudgetBuild(path = path, numSites = budgetSites)) for budgetSites in (numSites, 4 * numSites)))
+
+    for (budgetSites, budgetBuildMemory) in ((numSites, buildMemory), (4 * numSites, scaledBuildMemory)):
+        (_, memoryBudget) = buildBudgets[path][budgetSites]
+        assert budgetBuildMemory <= memoryBudget, f"{path} peaked at {budgetBuildMemory} bytes for {budgetSites} sites, over the {memoryBudget} byte budget"
+
+    assert scaledBuildMemory <= buildMemoryScaling * buildMemory, f"{path} peaked at {scaledBuildMemory} bytes for {4 * numSites} sites, over {buildMemoryScaling}x its {buildMemory} for {numSites}"
+
+@timingBudget
+@mark.parametrize("path", tuple(queryBudgets.keys()))
+def test_oracle_query_time_budget(path: str):
+    numSites = budgetNumsSites[path]
+    queryCoordinates = np.random.default_rng(seed = 0).random((numBudgetQueries, 2)).tolist()
+
+    queryTimes = []
+    for budgetSites in (numSites, 4 * numSites):
+        voronoiDiagram = _makeBudgetBuild(path = path, numSites = budgetSites)()
+        queryRectSize = np.sqrt(queryRectRegions / budgetSites)
+
+        # The first query builds the index - leave that to the build budgets.
+        voronoiDiagram.nearestRegion(x = 0.5, y = 0.5)
+
+        def _runQueries():
+            for (queryX, queryY) in queryCoordinates:
+                voronoiDiagram.nearestRegion(x = queryX, y = queryY)
+                voronoiDiagram.regionsInRect(x0 = queryX, y0 = queryY, x1 = queryX + queryRectSize, y1 = queryY + queryRectSize)
+
+        queryTimes.append(_bestTime(run = _runQueries))
+
+    queryBudget = queryBudgets[path]
+    for (budgetSites, queryTime) in zip((numSites, 4 * numSites), queryTimes):
+        assert queryTime <= queryBudget, f"{path} queries took {queryTime:.3f}s over {budgetSites} sites, over the {queryBudget}s budget"
+
+    (queryTime, scaledQueryTime) = queryTimes
+    assert scaledQueryTime <= queryTimeScaling * queryTime, f"{path} queries took {scaledQueryTime:.3f}s over {4 * numSites} sites, over {queryTimeScaling}x their {queryTime:.3f}s over {numSites}"
+
+# Reported with the test's results (--junitxml, with junit_family = xunit1) rather than budgeted: what a diagram keeps, once its points and vertices have been used, in each coordinateDtype.
+@mark.parametrize("numSites", (budgetNumsSites["wholePlaneWindow"], 4 * budgetNumsSites["wholePlaneWindow"]))
+def test_oracle_coordinate_storage_memory(numSites: int, record_property):
+    basePoints = _makeBasePoints(distribution = "uniform", numSites = numSites, seed = 0)
+    diagramMemory = {}
+
+    for coordinateDtype in (np.float64, np.float32):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            voronoiDiagram = VoronoiDiagram(basePoints = basePoints, planeWidth = planeWidth, planeHeight = planeHeight, window = (0, 0, 1, 1), coordinateDtype = coordinateDtype)
+            (voronoiDiagram.points, voronoiDiagram.vertices)
+            gc.collect()
+
+            (diagramMemory[coordinateDtype], _) = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        record_property(f"{np.dtype(coordinateDtype).name}DiagramBytes", diagramMemory[coordinateDtype])
+        record_property(f"{np.dtype(coordinateDtype).name}CoordinateArrayBytes", voronoiDiagram._unitPoints.nbytes + voronoiDiagram._unitVertices.nbytes)
+        del voronoiDiagram
+
+    assert diagramMemory[np.float32] < diagramMemory[np.float64], f"float32 storage kept {diagramMemory[np.float32]} bytes for {numSites} sites, no less than float64's {diagramMemory[np.float64]}"
\ No newline at end of file
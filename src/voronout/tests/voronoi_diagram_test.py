@@ -2,8 +2,13 @@ from ..Point import Point
 from ..VoronoiDiagram import VoronoiDiagram
 
 from pytest import raises
+from scipy.spatial import cKDTree, Delaunay
 from uuid import uuid4
 
+import gc
+import numpy as np
+import tracemalloc
+
 planeWidth = 600
 planeHeight = 600
 
@@ -72,6 +77,287 @@ def test_voronoi_diagram():
 
         assert testPointRegionNeighbors == testExpectedIdentifiers
 
+def test_voronoi_diagram_delaunay_triangles():
+    testPoints = tuple((siteOne, siteTwo, siteThree))
+    voronoiDiagram = VoronoiDiagram(basePoints = testPoints, planeWidth = planeWidth, planeHeight = planeHeight)
+
+    # Three sites have one diagram vertex, so one triangle connecting all of them.
+    assert voronoiDiagram.delaunayTriangles.shape == (1, 3)
+
+    triangleSiteIds = set((voronoiDiagram.siteIds[siteIndex] for siteIndex in voronoiDiagram.delaunayTriangles[0]))
+    assert triangleSiteIds == set(voronoiDiagram.points.keys())
+
+def test_voronoi_diagram_delaunay_triangles_match_scipy():
+    randomPoints = np.random.default_rng(seed = 26).random((50, 2))
+    testPoints = tuple((Point(x = randomX, y = randomY) for (randomX, randomY) in randomPoints))
+    voronoiDiagram = VoronoiDiagram(basePoints = testPoints, planeWidth = planeWidth, planeHeight = planeHeight)
+
+    # Site indices follow basePoints, so they're comparable with an independent triangulation of the same points.
+    scipyTriangles = set((frozenset(simplex) for simplex in Delaunay(np.array(testPoints)).simplices.tolist()))
+    diagramTriangles = set((frozenset(triangle) for triangle in voronoiDiagram.delaunayTriangles.tolist()))
+
+    assert diagramTriangles == scipyTriangles
+
+def test_voronoi_diagram_prepared_base_points_duplicates():
+    testPoints = tuple((siteOne, siteTwo, siteThree, Point(x = siteTwo.x, y = siteTwo.y)))
+    voronoiDiagram = VoronoiDiagram(basePoints = testPoints, planeWidth = planeWidth, planeHeight = planeHeight, prepareBasePoints = True)
+
+    # The duplicate is merged into siteTwo's site, leaving the same diagram as test_voronoi_diagram.
+    assert len(voronoiDiagram.points) == 3
+    assert len(voronoiDiagram.vertices) == 4
+
+    siteTwoId = _idsByPoint(pointsById = voronoiDiagram.points)[scaledSiteTwo]
+    assert voronoiDiagram.mergedBasePointIds == {3: siteTwoId}
+
+def test_voronoi_diagram_prepared_base_points_collinear():
+    testPoints = tuple((Point(x = 0.1, y = 0.5), Point(x = 0.3, y = 0.5), Point(x = 0.6, y = 0.5)))
+    voronoiDiagram = VoronoiDiagram(basePoints = testPoints, planeWidth = planeWidth, planeHeight = planeHeight, prepareBasePoints = True)
+
+    # Collinear sites split the plane into strips, bounded by the vertical bisectors x = 0.2 and x = 0.45.
+    expectedVertices = set((Point(x = 120, y = 0), Point(x = 120, y = 600), Point(x = 270, y = 0), Point(x = 270, y = 600)))
+    assert set(voronoiDiagram.vertices.values()) == expectedVertices
+
+    assert len(voronoiDiagram.points) == 3
+    assert len(voronoiDiagram.delaunayTriangles) == 0
+
+def test_voronoi_diagram_prepared_base_points_cocircular():
+    # A square, one corner nudged a grid cell off the circle through the others - qhull gives two vertices 0.0001 apart, joined by a ridge between opposite corners.
+    testPoints = tuple((Point(x = 0.3, y = 0.3), Point(x = 0.7, y = 0.3), Point(x = 0.3, y = 0.7), Point(x = 0.7001, y = 0.7), Point(x = 0.5, y = 0.95)))
+
+    unpreparedDiagram = VoronoiDiagram(basePoints = testPoints, planeWidth = planeWidth, planeHeight = planeHeight)
+    unpreparedCenterVertices = tuple((vertex for vertex in unpreparedDiagram.vertices.values() if abs(vertex.x - 300) < 1 and abs(vertex.y - 300) < 1))
+    assert len(unpreparedCenterVertices) == 2
+
+    voronoiDiagram = VoronoiDiagram(basePoints = testPoints, planeWidth = planeWidth, planeHeight = planeHeight, prepareBasePoints = True)
+    centerVertices = tuple((vertex for vertex in voronoiDiagram.vertices.values() if abs(vertex.x - 300) < 1 and abs(vertex.y - 300) < 1))
+    assert len(centerVertices) == 1
+
+    # Opposite corners only meet at the merged vertex, so aren't neighbors.
+    siteIds = _idsByPoint(pointsById = voronoiDiagram.points)
+    (topRightId, bottomLeftId) = (siteIds[Point(x = 420, y = 180)], siteIds[Point(x = 180, y = 420)])
+
+    assert topRightId not in voronoiDiagram.voronoiRegions[bottomLeftId].neighbors()
+    assert bottomLeftId not in voronoiDiagram.voronoiRegions[topRightId].neighbors()
+
+    # The merged vertex's four sites are fanned into two triangles.
+    assert len(voronoiDiagram.delaunayTriangles) == len(unpreparedDiagram.delaunayTriangles)
+
+def test_voronoi_diagram_prepared_base_points_too_few_distinct():
+    with raises(ValueError):
+        VoronoiDiagram(basePoints = (siteOne, siteTwo, siteOne), planeWidth = planeWidth, planeHeight = planeHeight, prepareBasePoints = True)
+
+def test_voronoi_diagram_previous_diagram_site_mismatch():
+    previousDiagram = VoronoiDiagram(basePoints = (siteOne, siteTwo, siteThree), planeWidth = planeWidth, planeHeight = planeHeight)
+    with raises(ValueError):
+        VoronoiDiagram(basePoints = (siteOne, siteTwo, siteThree, Point(x = 0.5, y = 0.5)), planeWidth = planeWidth, planeHeight = planeHeight, previousDiagram = previousDiagram)
+
+def test_voronoi_diagram_window():
+    randomPoints = np.random.default_rng(seed = 31).random((2000, 2))
+    testPoints = tuple((Point(x = randomX, y = randomY) for (randomX, randomY) in randomPoints))
+    (windowX0, windowY0, windowX1, windowY1) = (0.3, 0.4, 0.5, 0.55)
+
+    voronoiDiagram = VoronoiDiagram(basePoints = testPoints, planeWidth = 1, planeHeight = 1)
+    windowVoronoiDiagram = VoronoiDiagram(basePoints = testPoints, planeWidth = 1, planeHeight = 1, window = (windowX0, windowY0, windowX1, windowY1))
+
+    def _inWindow(point: Point) -> bool:
+        return windowX0 <= point.x <= windowX1 and windowY0 <= point.y <= windowY1
+
+    # Only the sites whose cells reach into the window are output..
+    assert len(windowVoronoiDiagram.points) < len(voronoiDiagram.points) / 10
+    assert all((_inWindow(point = vertex) for vertex in windowVoronoiDiagram.vertices.values()))
+
+    # .. and the diagram inside it is the full diagram's (to within boundValue's rounding - so keep clear of the window's edges).
+    def _wellInWindow(point: Point) -> bool:
+        return windowX0 + 0.001 < point.x < windowX1 - 0.001 and windowY0 + 0.001 < point.y < windowY1 - 0.001
+
+    fullVertices = np.array(tuple((vertex for vertex in voronoiDiagram.vertices.values() if _wellInWindow(point = vertex))))
+    windowVertices = np.array(tuple((vertex for vertex in windowVoronoiDiagram.vertices.values() if _wellInWindow(point = vertex))))
+
+    assert len(fullVertices) == len(windowVertices)
+    (vertexDistances, _) = cKDTree(fullVertices).query(windowVertices)
+    assert vertexDistances.max() <= 0.0002
+
+def test_voronoi_diagram_window_outside_bounds():
+    with raises(ValueError):
+        VoronoiDiagram(basePoints = (siteOne, siteTwo, siteThree), planeWidth = planeWidth, planeHeight = planeHeight, window = (0.5, 0.5, 1.5, 0.75))
+
+def test_voronoi_diagram_rescaled():
+    rng = np.random.default_rng(seed = 32)
+    basePoints = tuple((Point(x = x, y = y) for (x, y) in rng.random((200, 2)).tolist()))
+
+    voronoiDiagram = VoronoiDiagram(basePoints = basePoints, planeWidth = planeWidth, planeHeight = planeHeight)
+    rescaledDiagram = voronoiDiagram.rescaled(planeWidth = 1920, planeHeight = 1080)
+
+    # Built at 1920 x 1080 with voronoiDiagram's IDs, for comparison.
+    builtDiagram = VoronoiDiagram(basePoints = basePoints, planeWidth = 1920, planeHeight = 1080, previousDiagram = voronoiDiagram)
+
+    # The rescaled diagram shares everything but its coordinates..
+    assert rescaledDiagram.siteIds == voronoiDiagram.siteIds
+    assert rescaledDiagram.voronoiRegions is voronoiDiagram.voronoiRegions
+    assert rescaledDiagram.points.keys() == builtDiagram.points.keys()
+    assert rescaledDiagram.vertices.keys() == builtDiagram.vertices.keys()
+
+    # .. which are the built diagram's - back in the unit square, to within boundValue's rounding.
+    for (rescaledPoints, builtPoints) in ((rescaledDiagram.points, builtDiagram.points), (rescaledDiagram.vertices, builtDiagram.vertices)):
+        for (pointId, rescaledPoint) in rescaledPoints.items():
+            assert abs((rescaledPoint.x - builtPoints[pointId].x) / 1920) <= 0.0001
+            assert abs((rescaledPoint.y - builtPoints[pointId].y) / 1080) <= 0.0001
+
+    # voronoiDiagram itself is unchanged.
+    assert voronoiDiagram.planeWidth == planeWidth
+    assert all((0 <= point.x <= planeWidth and 0 <= point.y <= planeHeight for point in voronoiDiagram.points.values()))
+
+def test_voronoi_diagram_rescaled_origin():
+    voronoiDiagram = VoronoiDiagram(basePoints = (siteOne, siteTwo, siteThree), planeWidth = planeWidth, planeHeight = planeHeight)
+    movedDiagram = voronoiDiagram.rescaled(planeWidth = planeWidth, planeHeight = planeHeight, originX = 100, originY = -50)
+
+    assert np.allclose(movedDiagram.pointCoordinates(), voronoiDiagram.pointCoordinates() + (100, -50))
+    assert np.allclose(movedDiagram.vertexCoordinates(), voronoiDiagram.vertexCoordinates() + (100, -50))
+
+    # Position queries are in the moved plane's coordinates.
+    movedSiteTwo = movedDiagram.points[voronoiDiagram.siteIds[1]]
+    assert movedDiagram.nearestRegion(x = movedSiteTwo.x, y = movedSiteTwo.y).siteId == voronoiDiagram.siteIds[1]
+
+def test_voronoi_diagram_coordinates():
+    voronoiDiagram = VoronoiDiagram(basePoints = (siteOne, siteTwo, siteThree), planeWidth = planeWidth, planeHeight = planeHeight)
+
+    assert voronoiDiagram.pointCoordinates().tolist() == [[point.x, point.y] for point in voronoiDiagram.points.values()]
+    assert voronoiDiagram.vertexCoordinates().tolist() == [[voronoiDiagram.vertices[vertexId].x, voronoiDiagram.vertices[vertexId].y] for vertexId in voronoiDiagram.vertexIds]
+
+def test_voronoi_diagram_float32_coordinates():
+    rng = np.random.default_rng(seed = 33)
+    basePoints = tuple((Point(x = x, y = y) for (x, y) in rng.random((500, 2)).tolist()))
+
+    voronoiDiagram = VoronoiDiagram(basePoints = basePoints, planeWidth = planeWidth, planeHeight = planeHeight)
+    float32Diagram = VoronoiDiagram(basePoints = basePoints, planeWidth = planeWidth, planeHeight = planeHeight, previousDiagram = voronoiDiagram, coordinateDtype = np.float32)
+
+    # Half the coordinate arrays' memory - stored on boundValue's grid..
+    assert float32Diagram._unitPoints.dtype == np.int32
+    assert float32Diagram._unitPoints.nbytes * 2 == voronoiDiagram._unitPoints.nbytes
+    assert float32Diagram._unitVertices.nbytes * 2 == voronoiDiagram._unitVertices.nbytes
+
+    assert float32Diagram.pointCoordinates().dtype == np.float32
+    assert float32Diagram.pointCoordinates().nbytes * 2 == voronoiDiagram.pointCoordinates().nbytes
+    assert float32Diagram.vertexCoordinates().nbytes * 2 == voronoiDiagram.vertexCoordinates().nbytes
+
+    # .. so the same Points exactly, at any plane size - and float32 arrays to within boundValue's rounding, in unit space.
+    assert float32Diagram.vertices.keys() == voronoiDiagram.vertices.keys()
+    for (rescaledPlaneWidth, rescaledPlaneHeight) in ((planeWidth, planeHeight), (1920, 1080)):
+        (rescaledDiagram, rescaledFloat32Diagram) = (voronoiDiagram.rescaled(planeWidth = rescaledPlaneWidth, planeHeight = rescaledPlaneHeight), float32Diagram.rescaled(planeWidth = rescaledPlaneWidth, planeHeight = rescaledPlaneHeight))
+
+        assert rescaledFloat32Diagram.points == rescaledDiagram.points
+        assert rescaledFloat32Diagram.vertices == rescaledDiagram.vertices
+
+        for (float32Coordinates, float64Coordinates) in ((rescaledFloat32Diagram.pointCoordinates(), rescaledDiagram.pointCoordinates()), (rescaledFloat32Diagram.vertexCoordinates(), rescaledDiagram.vertexCoordinates())):
+            assert (np.abs(float32Coordinates - float64Coordinates) / (rescaledPlaneWidth, rescaledPlaneHeight)).max() <= 0.0001
+
+        assert np.array_equal(rescaledFloat32Diagram.vertexCoordinates(dtype = np.float64), rescaledDiagram.vertexCoordinates())
+
+def test_voronoi_diagram_float32_points_not_kept():
+    rng = np.random.default_rng(seed = 33)
+    basePoints = tuple((Point(x = x, y = y) for (x, y) in rng.random((1000, 2)).tolist()))
+
+    # { coordinateDtype: <bytes the diagram keeps once its points and vertices have been used> }
+    diagramMemory = {}
+
+    for coordinateDtype in (np.float64, np.float32):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            # A whole-plane window builds 1000 sites quickly - and keeps what any diagram does.
+            voronoiDiagram = VoronoiDiagram(basePoints = basePoints, planeWidth = planeWidth, planeHeight = planeHeight, window = (0, 0, 1, 1), coordinateDtype = coordinateDtype)
+            (voronoiDiagram.points, voronoiDiagram.vertices)
+            gc.collect()
+
+            (diagramMemory[coordinateDtype], _) = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # Points are made for each use instead of kept.
+        assert (voronoiDiagram.points is voronoiDiagram.points) == (coordinateDtype == np.float64)
+        del voronoiDiagram
+
+    # Without them, the diagram is about a fifth smaller - IDs and regions are most of the rest.
+    assert diagramMemory[np.float32] <= 0.85 * diagramMemory[np.float64]
+
+def test_voronoi_diagram_invalid_coordinate_dtype():
+    with raises(ValueError):
+        VoronoiDiagram(basePoints = (siteOne, siteTwo, siteThree), planeWidth = planeWidth, planeHeight = planeHeight, coordinateDtype = np.float16)
+
+def test_voronoi_diagram_periodic():
+    rng = np.random.default_rng(seed = 34)
+    basePoints = tuple((Point(x = x, y = y) for (x, y) in rng.random((300, 2)).tolist()))
+
+    voronoiDiagram = VoronoiDiagram(basePoints = basePoints, planeWidth = planeWidth, planeHeight = planeHeight, periodic = True)
+
+    # Wrapped around, the plane is a torus - where (for sites in general position) there are two vertices and two triangles per site..
+    assert len(voronoiDiagram.vertices) == 2 * len(basePoints)
+    assert len(voronoiDiagram.delaunayTriangles) == 2 * len(basePoints)
+
+    # .. each vertex shared by three regions, and each neighbor a neighbor right back.
+    vertexRegionCounts = {}
+    for (siteId, voronoiRegion) in voronoiDiagram.voronoiRegions.items():
+        for regionVertexId in set((vertexId for edge in voronoiRegion.edges for vertexId in (edge.vertex0Id, edge.vertex1Id))):
+            vertexRegionCounts[regionVertexId] = vertexRegionCounts.get(regionVertexId, 0) + 1
+
+        for edge in voronoiRegion.edges:
+            assert siteId in tuple((neighborEdge.neighborSiteId for neighborEdge in voronoiDiagram.voronoiRegions[edge.neighborSiteId].edges))
+
+    assert set(vertexRegionCounts.values()) == {3}
+
+    # Every vertex is on the plane, and (to within boundValue's rounding, scaled up) equidistant from its regions' sites - taking the nearest image of each.
+    for (siteId, voronoiRegion) in voronoiDiagram.voronoiRegions.items():
+        site = voronoiDiagram.points[siteId]
+
+        for edge in voronoiRegion.edges:
+            neighborSite = voronoiDiagram.points[edge.neighborSiteId]
+
+            for vertexId in (edge.vertex0Id, edge.vertex1Id):
+                vertex = voronoiDiagram.vertices[vertexId]
+                assert 0 <= vertex.x <= planeWidth and 0 <= vertex.y <= planeHeight
+
+                (siteDistance, neighborSiteDistance) = tuple((np.hypot(*np.minimum(np.abs(vertexOffset), (planeWidth, planeHeight) - np.abs(vertexOffset))) for vertexOffset in (np.array((vertex.x - regionSite.x, vertex.y - regionSite.y)) for regionSite in (site, neighborSite))))
+                assert abs(siteDistance - neighborSiteDistance) <= 0.0002 * planeWidth
+
+def test_voronoi_diagram_periodic_previous_diagram():
+    rng = np.random.default_rng(seed = 34)
+    baseCoordinates = rng.random((100, 2)) * 0.98 + 0.01
+
+    previousDiagram = VoronoiDiagram(basePoints = tuple((Point(x = x, y = y) for (x, y) in baseCoordinates.tolist())), planeWidth = planeWidth, planeHeight = planeHeight, periodic = True)
+    currentDiagram = VoronoiDiagram(basePoints = tuple((Point(x = x, y = y) for (x, y) in (baseCoordinates + 0.0002).tolist())), planeWidth = planeWidth, planeHeight = planeHeight, periodic = True, previousDiagram = previousDiagram)
+
+    # The same sites' images meet at each vertex, so each keeps its ID - including those wrapped across the plane's edges.
+    assert currentDiagram.vertices.keys() == previousDiagram.vertices.keys()
+
+def test_voronoi_diagram_periodic_nearest_region():
+    voronoiDiagram = VoronoiDiagram(basePoints = (Point(x = 0.05, y = 0.5), Point(x = 0.5, y = 0.5), Point(x = 0.7, y = 0.2)), planeWidth = planeWidth, planeHeight = planeHeight, periodic = True)
+
+    # Just inside the right edge is nearest the site just inside the left one.
+    assert voronoiDiagram.nearestRegion(x = planeWidth - 1, y = planeHeight / 2).siteId == voronoiDiagram.siteIds[0]
+
+def test_voronoi_diagram_periodic_duplicate_images():
+    # Wrapped around, x = 1 is x = 0 - so these are the same site twice.
+    basePoints = tuple((Point(x = 0, y = 0.5), Point(x = 0.4, y = 0.2), Point(x = 0.6, y = 0.8), Point(x = 1, y = 0.5)))
+
+    with raises(ValueError):
+        VoronoiDiagram(basePoints = basePoints, planeWidth = planeWidth, planeHeight = planeHeight, periodic = True)
+
+    voronoiDiagram = VoronoiDiagram(basePoints = basePoints, planeWidth = planeWidth, planeHeight = planeHeight, periodic = True, prepareBasePoints = True)
+
+    assert len(voronoiDiagram.siteIds) == 3
+    assert voronoiDiagram.mergedBasePointIds == {3: voronoiDiagram.siteIds[0]}
+
+def test_voronoi_diagram_periodic_window():
+    with raises(ValueError):
+        VoronoiDiagram(basePoints = (siteOne, siteTwo, siteThree), planeWidth = planeWidth, planeHeight = planeHeight, window = (0.25, 0.25, 0.75, 0.75), periodic = True)
+
+def test_voronoi_diagram_vertex_at_sites_midpoint():
+    # Found by the oracle tests - one infinite ridge's vertex is (to boundValue's precision) at its sites' midpoint, which gave no direction to extend it in.
+    baseCoordinates = ((0.0, 0.4), (0.0, 0.5994), (0.0011, 0.801), (0.0013, 0.3987), (0.7983, 0.3984), (0.801, 0.0011), (0.9987, 0.4005), (0.9991, 0.798), (0.9997, 1.0), (1.0, 0.6013))
+    voronoiDiagram = VoronoiDiagram(basePoints = tuple((Point(x = baseX, y = baseY) for (baseX, baseY) in baseCoordinates)), planeWidth = planeWidth, planeHeight = planeHeight)
+
+    assert all((0 <= vertex.x <= planeWidth and 0 <= vertex.y <= planeHeight for vertex in voronoiDiagram.vertices.values()))
+
 def test_voronoi_diagram_too_few_base_points():
     with raises(ValueError):
         VoronoiDiagram(basePoints = (siteOne, siteTwo), planeWidth = planeWidth, planeHeight = planeHeight)
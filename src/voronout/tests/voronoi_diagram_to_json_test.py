@@ -1,7 +1,9 @@
 from ..Point import Point
 
 from ..VoronoiDiagram import VoronoiDiagram
-from ..VoronoiDiagramToJSON import toJson
+from ..VoronoiDiagramToJSON import toJson, toJsonDelta, fromCompactJson
+
+import json
 
 testOutputFile = "voronoi.json"
 
@@ -19,4 +21,42 @@ def test_voronoi_diagram_to_json(tmp_path):
     voronoiDiagram = VoronoiDiagram(basePoints = diagramPoints, planeWidth = 600, planeHeight = 600)
     toJson(voronoiDiagram = voronoiDiagram, voronoiJsonPath = voronoiJsonPath)
 
-    assert voronoiJsonPath.exists()
\ No newline at end of file
+    assert voronoiJsonPath.exists()
+
+def test_voronoi_diagram_to_json_delta(tmp_path):
+    diagramPoints = tuple(
+        (Point(x = .0556, y = .1333),
+        Point(x = .1667, y = .2778),
+        Point(x = .4444, y = .1000))
+    )
+
+    movedDiagramPoints = diagramPoints[:2] + tuple((Point(x = .4500, y = .1000),))
+
+    voronoiJsonPath = (tmp_path / testOutputFile)
+
+    previousDiagram = VoronoiDiagram(basePoints = diagramPoints, planeWidth = 600, planeHeight = 600)
+    currentDiagram = VoronoiDiagram(basePoints = movedDiagramPoints, planeWidth = 600, planeHeight = 600, previousDiagram = previousDiagram)
+    toJsonDelta(previousDiagram = previousDiagram, currentDiagram = currentDiagram, voronoiJsonPath = voronoiJsonPath)
+
+    with open(voronoiJsonPath) as jsonIn:
+        voronoiJsonDelta = json.load(jsonIn)
+
+    assert voronoiJsonDelta["points"] == {str(currentDiagram.siteIds[2]): {"x": 270.0, "y": 60.0}}
+    assert voronoiJsonDelta["removedPoints"] == []
+
+def test_voronoi_diagram_to_compact_json(tmp_path):
+    diagramPoints = tuple(
+        (Point(x = .0556, y = .1333),
+        Point(x = .1667, y = .2778),
+        Point(x = .4444, y = .1000))
+    )
+
+    voronoiJsonPath = (tmp_path / testOutputFile)
+
+    voronoiDiagram = VoronoiDiagram(basePoints = diagramPoints, planeWidth = 600, planeHeight = 600)
+    toJson(voronoiDiagram = voronoiDiagram, voronoiJsonPath = voronoiJsonPath, compact = True, deltaEncode = True)
+
+    readVoronoiDiagram = fromCompactJson(voronoiJsonPath = voronoiJsonPath)
+
+    assert tuple(readVoronoiDiagram.points.values()) == tuple(voronoiDiagram.points.values())
+    assert set(readVoronoiDiagram.vertices.values()) == set(voronoiDiagram.vertices.values())
\ No newline at end of file
@@ -0,0 +1,93 @@
+from ..Point import Point
+from ..VoronoiDiagram import VoronoiDiagram
+
+import numpy as np
+
+planeWidth = 600
+planeHeight = 400
+
+randomPoints = np.random.default_rng(seed = 30).random((200, 2))
+voronoiDiagram = VoronoiDiagram(basePoints = tuple((Point(x = randomX, y = randomY) for (randomX, randomY) in randomPoints)), planeWidth = planeWidth, planeHeight = planeHeight)
+
+def _regionVertices(siteId) -> np.ndarray:
+    region = voronoiDiagram.voronoiRegions[siteId]
+    return np.array(tuple((voronoiDiagram.vertices[vertexId] for edge in region.edges for vertexId in (edge.vertex0Id, edge.vertex1Id))))
+
+def test_regions_in_rect():
+    (x0, y0, x1, y1) = (100, 50, 250, 150)
+    regionsInRect = voronoiDiagram.regionsInRect(x0 = x0, y0 = y0, x1 = x1, y1 = y1)
+
+    # Compare against a scan of every region - any region with a site or vertex in the rectangle must be found.
+    for (siteId, site) in voronoiDiagram.points.items():
+        regionCoordinates = np.vstack((_regionVertices(siteId = siteId), np.array(site)))
+        coordinatesInRect = (regionCoordinates[:, 0] >= x0) & (regionCoordinates[:, 0] <= x1) & (regionCoordinates[:, 1] >= y0) & (regionCoordinates[:, 1] <= y1)
+
+        if coordinatesInRect.any():
+            assert voronoiDiagram.voronoiRegions[siteId] in regionsInRect
+
+    assert len(regionsInRect) < len(voronoiDiagram.voronoiRegions) / 2
+
+def test_regions_in_rect_outside_plane():
+    assert voronoiDiagram.regionsInRect(x0 = -20, y0 = -20, x1 = -10, y1 = -10) == tuple()
+    assert voronoiDiagram.nearestRegion(x = -10, y = -10) is None
+
+def test_regions_in_rect_plane_corner():
+    # The corner isn't an edge vertex, but the region containing it still needs to be found.
+    cornerRegion = voronoiDiagram.nearestRegion(x = 0, y = 0)
+    assert cornerRegion in voronoiDiagram.regionsInRect(x0 = 0, y0 = 0, x1 = 0.5, y1 = 0.5)
+
+def test_nearest_region():
+    queryPoint = np.array((321.5, 123.25))
+    siteIds = tuple(voronoiDiagram.points.keys())
+
+    # Regions are built in the unit square, so distances are compared there - on this 600 x 400 plane, not the same as in plane coordinates.
+    planeScale = np.array((planeWidth, planeHeight))
+    siteDistances = tuple((np.hypot(*((np.array(site) - queryPoint) / planeScale)) for site in voronoiDiagram.points.values()))
+    expectedSiteId = siteIds[int(np.argmin(siteDistances))]
+
+    assert voronoiDiagram.nearestRegion(x = queryPoint[0], y = queryPoint[1]).siteId == expectedSiteId
+
+def test_regions_in_rect_window():
+    # The window is (180, 160) -> (300, 200) on the plane.
+    windowDiagram = VoronoiDiagram(basePoints = tuple((Point(x = randomX, y = randomY) for (randomX, randomY) in randomPoints)), planeWidth = planeWidth, planeHeight = planeHeight, window = (0.3, 0.4, 0.5, 0.5))
+
+    # Nothing exists outside the window - not even the plane's corners..
+    assert windowDiagram.regionsInRect(x0 = 0, y0 = 0, x1 = 10, y1 = 10) == tuple()
+    assert windowDiagram.regionsInRect(x0 = 590, y0 = 390, x1 = 600, y1 = 400) == tuple()
+
+    assert windowDiagram.nearestRegion(x = 5, y = 5) is None
+    assert windowDiagram.nearestRegion(x = 595, y = 395) is None
+
+    # .. but the window's own corners are still found.
+    for (cornerX, cornerY) in ((180, 160), (300, 160), (180, 200), (300, 200)):
+        cornerRegion = windowDiagram.nearestRegion(x = cornerX, y = cornerY)
+        assert cornerRegion in windowDiagram.regionsInRect(x0 = cornerX, y0 = cornerY, x1 = cornerX, y1 = cornerY)
+
+    assert set((region.siteId for region in windowDiagram.regionsInRect(x0 = 0, y0 = 0, x1 = 600, y1 = 400))) == set(windowDiagram.siteIds)
+
+def test_nearest_region_non_square_plane():
+    # On this 600 x 400 plane, (312, 200) is nearer (300, 120) than (420, 200) - but in the unit square, where the regions are built, it's nearer (0.7, 0.5) than (0.5, 0.3).
+    sites = tuple((Point(x = 0.5, y = 0.3), Point(x = 0.7, y = 0.5), Point(x = 0.1, y = 0.9)))
+    nonSquareDiagram = VoronoiDiagram(basePoints = sites, planeWidth = planeWidth, planeHeight = planeHeight)
+
+    assert nonSquareDiagram.nearestRegion(x = 312, y = 200).siteId == nonSquareDiagram.siteIds[1]
+
+def test_regions_in_rect_periodic():
+    periodicDiagram = VoronoiDiagram(basePoints = tuple((Point(x = randomX, y = randomY) for (randomX, randomY) in randomPoints)), planeWidth = planeWidth, planeHeight = planeHeight, periodic = True)
+    rng = np.random.default_rng(seed = 34)
+
+    # Random 0.2 x 0.2 rectangles, plus some straddling x = 0/planeWidth and y = 0/planeHeight - which, wrapped around, are the same edge.
+    (rectWidth, rectHeight) = (0.2 * planeWidth, 0.2 * planeHeight)
+    randomRects = tuple(((rectX, rectY, rectX + rectWidth, rectY + rectHeight) for (rectX, rectY) in (rng.random((200, 2)) * (planeWidth - rectWidth, planeHeight - rectHeight)).tolist()))
+    straddlingRects = tuple(((-20, 100, 20, 200), (planeWidth - 20, 100, planeWidth + 20, 200), (250, -15, 350, 15), (250, planeHeight - 15, 350, planeHeight + 15), (-20, -15, 20, 15), (planeWidth - 5, planeHeight - 5, planeWidth + 5, planeHeight + 5)))
+
+    for (x0, y0, x1, y1) in randomRects + straddlingRects:
+        regionsInRect = periodicDiagram.regionsInRect(x0 = x0, y0 = y0, x1 = x1, y1 = y1)
+
+        # Whichever region contains each point of the rectangle must be found.
+        (sampleXs, sampleYs) = np.meshgrid(np.linspace(x0, x1, 6), np.linspace(y0, y1, 6))
+        for (sampleX, sampleY) in zip(sampleXs.ravel().tolist(), sampleYs.ravel().tolist()):
+            assert periodicDiagram.nearestRegion(x = sampleX, y = sampleY) in regionsInRect
+
+    # Across the edge is the other side of the plane.
+    assert periodicDiagram.regionsInRect(x0 = planeWidth + 10, y0 = 100, x1 = planeWidth + 30, y1 = 120) == periodicDiagram.regionsInRect(x0 = 10, y0 = 100, x1 = 30, y1 = 120)
\ No newline at end of file
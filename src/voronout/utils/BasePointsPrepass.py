@@ -0,0 +1,73 @@
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+import numpy as np
+
+# boundValue keeps 4 decimal places, so scaling by this puts every coordinate on an integer grid.
+_gridScale = 10000
+
+# Beyond 2 * sqrt(2) from a line through the unit square, a point is further from every point in the square than any site on that line is.
+_ghostSiteDistance = 10
+
+# Returns (<indices of basePoints to keep>, { <index of a dropped duplicate>: <index into the kept indices it merged into> }).
+# With periodic, the plane wraps around - so x = 1 duplicates x = 0, and y = 1 duplicates y = 0.
+def dedupeBasePoints(basePoints: tuple, periodic: bool = False) -> tuple[tuple[int], dict[int, int]]:
+    keptIndices = []
+    mergedIndices = {}
+
+    # { (gridX, gridY): <index into keptIndices> } - one dict lookup per point, so linear in len(basePoints).
+    gridCells = {}
+
+    for (basePointIndex, basePoint) in enumerate(basePoints):
+        gridCell = tuple((round(basePoint.x * _gridScale), round(basePoint.y * _gridScale)))
+        if periodic:
+            gridCell = tuple((gridCell[0] % _gridScale, gridCell[1] % _gridScale))
+        keptIndex = gridCells.get(gridCell)
+
+        if keptIndex is None:
+            gridCells[gridCell] = len(keptIndices)
+            keptIndices.append(basePointIndex)
+        else:
+            mergedIndices[basePointIndex] = keptIndex
+
+    return tuple(keptIndices), mergedIndices
+
+# qhull can't build a diagram from sites on one line. If spatialPoints are (to boundValue's precision) collinear, returns two " ghost " sites either side of the line.
+# Adding them gives qhull a proper 2D input whose ridges between the real sites are exactly the real bisectors - no retry needed.
+# Sites only nearly collinear - further than that from the line - are a proper 2D input already, if with far-off vertices that bounding clips.
+def findCollinearGhostSites(spatialPoints: np.ndarray) -> np.ndarray | None:
+    firstPoint = spatialPoints[0]
+    firstPointOffsets = spatialPoints - firstPoint
+
+    farthestOffset = firstPointOffsets[np.argmax(np.hypot(firstPointOffsets[:, 0], firstPointOffsets[:, 1]))]
+    lineDirection = farthestOffset / np.hypot(farthestOffset[0], farthestOffset[1])
+    lineNormal = np.array((-lineDirection[1], lineDirection[0]))
+
+    distancesFromLine = np.abs(firstPointOffsets @ lineNormal)
+    if distancesFromLine.max() > 1 / _gridScale:
+        return None
+
+    lineCenter = spatialPoints.mean(axis = 0)
+    return np.array((lineCenter + (_ghostSiteDistance * lineNormal), lineCenter - (_ghostSiteDistance * lineNormal)))
+
+
+# Sites that are nearly, but not exactly, cocircular - common once snapped to boundValue's grid - give qhull several vertices closer together than boundValue keeps, joined by ridges of no real length.
+# Returns (ridgePoints, ridgeVertices) with each such cluster of vertices merged into its first and the ridges inside it dropped - the diagram as if the sites were exactly cocircular.
+def mergeCocircularVertices(vertices: np.ndarray, ridgePoints: np.ndarray, ridgeVertices: list[list[int]]) -> tuple[np.ndarray, list[list[int]]]:
+    closeVertexPairs = cKDTree(vertices).query_pairs(r = 1 / _gridScale, output_type = "ndarray")
+    if not len(closeVertexPairs):
+        return ridgePoints, ridgeVertices
+
+    closeVertexGraph = coo_matrix((np.ones(len(closeVertexPairs)), (closeVertexPairs[:, 0], closeVertexPairs[:, 1])), shape = (len(vertices), len(vertices)))
+    (numClusters, vertexClusters) = connected_components(closeVertexGraph, directed = False)
+
+    clusterFirstVertices = np.full(numClusters, len(vertices), dtype = np.intp)
+    np.minimum.at(clusterFirstVertices, vertexClusters, np.arange(len(vertices)))
+
+    # -1 (a ridge going off to infinity) stays -1.
+    mergedRidgeVertices = np.asarray(ridgeVertices, dtype = np.intp).reshape(-1, 2)
+    mergedRidgeVertices = np.where(mergedRidgeVertices == -1, -1, clusterFirstVertices[vertexClusters[mergedRidgeVertices]])
+
+    ridgesWithLength = mergedRidgeVertices[:, 0] != mergedRidgeVertices[:, 1]
+    return ridgePoints[ridgesWithLength], mergedRidgeVertices[ridgesWithLength].tolist()
\ No newline at end of file
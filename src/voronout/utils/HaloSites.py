@@ -0,0 +1,69 @@
+from math import ceil, sqrt
+
+from scipy.spatial import cKDTree
+
+import numpy as np
+
+def _sitesInBox(sites: np.ndarray, box: tuple[float, float, float, float], margin: float) -> np.ndarray:
+    (minX, minY, maxX, maxY) = box
+    return np.flatnonzero((sites[:, 0] >= minX - margin) & (sites[:, 0] <= maxX + margin) & (sites[:, 1] >= minY - margin) & (sites[:, 1] <= maxY + margin))
+
+# An upper bound on how far any point in box is from its nearest site in siteTree.
+# Nearest-site distance changes no faster than position does, so sampling a grid over box and adding half the grid's cell diagonal bounds it everywhere.
+def _nearestSiteDistanceBound(siteTree: cKDTree, box: tuple[float, float, float, float], samplesPerAxis: int) -> float:
+    (minX, minY, maxX, maxY) = box
+
+    (sampleXs, sampleYs) = np.meshgrid(np.linspace(minX, maxX, samplesPerAxis), np.linspace(minY, maxY, samplesPerAxis))
+    (sampleDistances, _) = siteTree.query(np.column_stack((sampleXs.ravel(), sampleYs.ravel())))
+
+    sampleCellDiagonal = sqrt(pow(maxX - minX, 2) + pow(maxY - minY, 2)) / (samplesPerAxis - 1)
+    return float(sampleDistances.max()) + (sampleCellDiagonal / 2)
+
+# Indices of the sites whose Voronoi cells could reach into box = (minX, minY, maxX, maxY) - the sites in it plus a halo around it.
+# Any site nearest to some point q in box is at most <the nearest-site distance bound> from q, so taking every site within that bound of box is exact.
+# The bound is found from the sites within margin of box, doubling margin until the bound fits inside it - the work stays proportional to box's contents.
+def selectHaloSites(sites: np.ndarray, box: tuple[float, float, float, float], minSites: int) -> np.ndarray:
+    # Start with room for about two sites' spacing around box, were the sites spread evenly.
+    margin = 2 / sqrt(len(sites))
+
+    while True:
+        candidateSiteIndices = _sitesInBox(sites = sites, box = box, margin = margin)
+
+        if len(candidateSiteIndices) >= minSites:
+            samplesPerAxis = max(2, ceil(sqrt(len(candidateSiteIndices))) + 1)
+            distanceBound = _nearestSiteDistanceBound(siteTree = cKDTree(sites[candidateSiteIndices]), box = box, samplesPerAxis = samplesPerAxis)
+
+            # Every site closer to a point in box than its nearest candidate is within margin, so is a candidate already.
+            if distanceBound <= margin:
+                haloSiteIndices = _sitesInBox(sites = sites, box = box, margin = distanceBound)
+                # Any superset of haloSiteIndices is exact too, and qhull needs minSites.
+                return haloSiteIndices if len(haloSiteIndices) >= minSites else candidateSiteIndices
+
+        if len(candidateSiteIndices) == len(sites):
+            return candidateSiteIndices
+
+        margin *= 2
+
+# Indices and (x, y) shifts of the sites' periodic images - copies moved by whole unit squares - that can shape a cell of a site in the unit square, for sites in (0, 0) -> (1, 1).
+# With wrapping, every point is within <the nearest-site distance bound> of a site, so no cell reaches further than that from its site - and its neighbors are within twice it.
+def selectPeriodicHaloSites(sites: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    unitSquare = tuple((0, 0, 1, 1))
+
+    # boxsize wraps distances around the unit square, which needs sites in [0, 1).
+    samplesPerAxis = (2 * ceil(sqrt(len(sites)))) + 1
+    haloMargin = 2 * _nearestSiteDistanceBound(siteTree = cKDTree(np.mod(sites, 1), boxsize = 1), box = unitSquare, samplesPerAxis = samplesPerAxis)
+
+    haloSiteIndices = []
+    haloShifts = []
+
+    # Few sites can mean a margin past the neighboring squares.
+    shiftRange = ceil(haloMargin)
+    for shiftX in range(-shiftRange, shiftRange + 1):
+        for shiftY in range(-shiftRange, shiftRange + 1):
+            if shiftX or shiftY:
+                shiftSiteIndices = _sitesInBox(sites = sites + (shiftX, shiftY), box = unitSquare, margin = haloMargin)
+
+                haloSiteIndices.append(shiftSiteIndices)
+                haloShifts.append(np.tile((shiftX, shiftY), (len(shiftSiteIndices), 1)))
+
+    return np.concatenate(haloSiteIndices), np.concatenate(haloShifts)
\ No newline at end of file
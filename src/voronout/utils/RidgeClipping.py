@@ -0,0 +1,69 @@
+import numpy as np
+
+# Clips every ridge of a scipy.spatial Voronoi diagram to box = (minX, minY, maxX, maxY) at once - box can also be one box per ridge, shaped (len(ridgePoints), 4).
+# Infinite ridges are rays from their finite vertex, perpendicular to their sites and away from center (any point inside the sites' convex hull).
+# Returns (vertex0s, vertex1s, vertex0sClipped, vertex1sClipped, ridgesInBox) in ridgeVertices' order - the vertices of ridges not in box are meaningless.
+def clipRidgesToBox(sites: np.ndarray, vertices: np.ndarray, ridgePoints: np.ndarray, ridgeVertices: np.ndarray, box: np.ndarray, center: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    ridgePoints = np.asarray(ridgePoints, dtype = np.intp).reshape(-1, 2)
+    ridgeVertices = np.asarray(ridgeVertices, dtype = np.intp).reshape(-1, 2)
+    box = np.asarray(box, dtype = np.float64)
+
+    if (ridgeVertices == -1).all(axis = 1).any():
+        raise ValueError("Ridges without any finite vertex (from collinear sites) can't be clipped")
+
+    # Rays start from their finite vertex, so start from vertex1 when vertex0 is the infinite one.
+    startsFromVertex1 = ridgeVertices[:, 0] == -1
+    ridgesInfinite = (ridgeVertices == -1).any(axis = 1)
+
+    # Padding vertices means -1 (infinite) indexes a real, if unused, row.
+    paddedVertices = np.concatenate((np.asarray(vertices, dtype = np.float64).reshape(-1, 2), np.zeros((1, 2))))
+
+    ridgeStarts = paddedVertices[np.where(startsFromVertex1, ridgeVertices[:, 1], ridgeVertices[:, 0])]
+    ridgeEnds = paddedVertices[ridgeVertices[:, 1]]
+
+    ridgeSites = sites[ridgePoints]
+    siteDeltas = ridgeSites[:, 1] - ridgeSites[:, 0]
+    ridgeNormals = np.column_stack((-siteDeltas[:, 1], siteDeltas[:, 0]))
+
+    normalSigns = np.sign(np.einsum("ij,ij->i", ridgeSites.mean(axis = 1) - center, ridgeNormals))
+    rayDirections = ridgeNormals * np.where(normalSigns == 0, 1, normalSigns)[:, None]
+
+    ridgeDirections = np.where(ridgesInfinite[:, None], rayDirections, ridgeEnds - ridgeStarts)
+    ridgeLengths = np.where(ridgesInfinite, np.inf, 1.0)
+
+    # Liang-Barsky: ridge = start + t * direction, narrowed to the t range inside each of the box's slabs.
+    tEnters = np.zeros(len(ridgePoints))
+    tExits = ridgeLengths.copy()
+    ridgesInBox = np.ones(len(ridgePoints), dtype = bool)
+
+    for (axis, slabMin, slabMax) in ((0, box[..., 0], box[..., 2]), (1, box[..., 1], box[..., 3])):
+        axisStarts = ridgeStarts[:, axis]
+        axisDirections = ridgeDirections[:, axis]
+        ridgesParallel = axisDirections == 0
+
+        with np.errstate(divide = "ignore", invalid = "ignore"):
+            tSlabMins = (slabMin - axisStarts) / axisDirections
+            tSlabMaxes = (slabMax - axisStarts) / axisDirections
+
+        tEnters = np.maximum(tEnters, np.where(ridgesParallel, -np.inf, np.minimum(tSlabMins, tSlabMaxes)))
+        tExits = np.minimum(tExits, np.where(ridgesParallel, np.inf, np.maximum(tSlabMins, tSlabMaxes)))
+
+        ridgesInBox &= ~(ridgesParallel & ((axisStarts < slabMin) | (axisStarts > slabMax)))
+
+    # Ridges that only touch the box at a point aren't in it.
+    ridgesInBox &= tEnters < tExits
+    tExits = np.where(ridgesInBox, tExits, tEnters)
+
+    clippedStarts = ridgeStarts + (tEnters[:, None] * ridgeDirections)
+    clippedEnds = ridgeStarts + (tExits[:, None] * ridgeDirections)
+
+    startsClipped = tEnters > 0
+    endsClipped = tExits < ridgeLengths
+
+    vertex0s = np.where(startsFromVertex1[:, None], clippedEnds, clippedStarts)
+    vertex1s = np.where(startsFromVertex1[:, None], clippedStarts, clippedEnds)
+
+    vertex0sClipped = np.where(startsFromVertex1, endsClipped, startsClipped)
+    vertex1sClipped = np.where(startsFromVertex1, startsClipped, endsClipped)
+
+    return vertex0s, vertex1s, vertex0sClipped, vertex1sClipped, ridgesInBox
\ No newline at end of file
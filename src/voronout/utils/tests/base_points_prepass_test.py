@@ -0,0 +1,53 @@
+from ...Point import Point
+from ..BasePointsPrepass import dedupeBasePoints, findCollinearGhostSites, mergeCocircularVertices
+
+import numpy as np
+
+def test_dedupe_base_points():
+    basePoints = tuple((Point(x = 0.1, y = 0.2), Point(x = 0.3, y = 0.4), Point(x = 0.1, y = 0.2), Point(x = 0.30001, y = 0.4), Point(x = 0.5, y = 0.6)))
+    (keptIndices, mergedIndices) = dedupeBasePoints(basePoints = basePoints)
+
+    # 0.30001 rounds into the same 0.0001 grid cell as 0.3.
+    assert keptIndices == tuple((0, 1, 4))
+    assert mergedIndices == {2: 0, 3: 1}
+
+def test_dedupe_base_points_periodic():
+    basePoints = tuple((Point(x = 0, y = 0.2), Point(x = 0.5, y = 0.5), Point(x = 1, y = 0.2), Point(x = 0.5, y = 1), Point(x = 0.5, y = 0)))
+
+    # Only once the plane wraps around are x = 1 and y = 1 duplicates of x = 0 and y = 0.
+    assert dedupeBasePoints(basePoints = basePoints) == tuple((tuple((0, 1, 2, 3, 4)), {}))
+    assert dedupeBasePoints(basePoints = basePoints, periodic = True) == tuple((tuple((0, 1, 3)), {2: 0, 4: 2}))
+
+def test_find_collinear_ghost_sites():
+    collinearPoints = np.array(((0.1, 0.1), (0.3, 0.3), (0.7, 0.7)))
+    ghostSites = findCollinearGhostSites(spatialPoints = collinearPoints)
+
+    assert ghostSites.shape == (2, 2)
+
+    # Both ghosts sit on the line's perpendicular through its center, far outside the unit square.
+    for ghostSite in ghostSites:
+        assert abs(np.dot(ghostSite - collinearPoints.mean(axis = 0), np.array((1, 1)))) < 1e-9
+        assert np.hypot(*(ghostSite - collinearPoints.mean(axis = 0))) > 2 * np.sqrt(2)
+
+def test_find_collinear_ghost_sites_not_collinear():
+    assert findCollinearGhostSites(spatialPoints = np.array(((0.1, 0.1), (0.3, 0.3), (0.7, 0.6)))) is None
+
+def test_merge_cocircular_vertices():
+    # Vertices 1 and 2 are less than a grid cell apart, so the ridge between them is dropped and 2 becomes 1.
+    vertices = np.array(((0.5, 0.255), (0.5, 0.5), (0.50005, 0.50005)))
+    ridgePoints = np.array(((1, 4), (1, 0), (1, 2), (1, 3), (4, 0), (0, 2), (2, 3)))
+    ridgeVertices = [[-1, 0], [0, 1], [1, 2], [-1, 2], [-1, 0], [-1, 1], [-1, 2]]
+
+    (mergedRidgePoints, mergedRidgeVertices) = mergeCocircularVertices(vertices = vertices, ridgePoints = ridgePoints, ridgeVertices = ridgeVertices)
+
+    assert mergedRidgePoints.tolist() == [[1, 4], [1, 0], [1, 3], [4, 0], [0, 2], [2, 3]]
+    assert mergedRidgeVertices == [[-1, 0], [0, 1], [-1, 1], [-1, 0], [-1, 1], [-1, 1]]
+
+def test_merge_cocircular_vertices_none_close():
+    ridgePoints = np.array(((0, 1), (1, 2)))
+    ridgeVertices = [[-1, 0], [0, 1]]
+
+    (mergedRidgePoints, mergedRidgeVertices) = mergeCocircularVertices(vertices = np.array(((0.2, 0.2), (0.6, 0.6))), ridgePoints = ridgePoints, ridgeVertices = ridgeVertices)
+
+    assert mergedRidgePoints is ridgePoints
+    assert mergedRidgeVertices is ridgeVertices
\ No newline at end of file
@@ -0,0 +1,45 @@
+from ..HaloSites import selectHaloSites, selectPeriodicHaloSites
+
+from scipy.spatial import cKDTree
+
+import numpy as np
+
+def test_select_halo_sites():
+    rng = np.random.default_rng(seed = 31)
+    sites = rng.random((5000, 2))
+    box = tuple((0.4, 0.4, 0.5, 0.45))
+
+    haloSiteIndices = selectHaloSites(sites = sites, box = box, minSites = 3)
+
+    # Every point in box must have its nearest site among the selected ones..
+    boxSamples = rng.random((20000, 2)) * (0.1, 0.05) + (0.4, 0.4)
+    (_, nearestSiteIndices) = cKDTree(sites).query(boxSamples)
+    assert set(nearestSiteIndices.tolist()) <= set(haloSiteIndices.tolist())
+
+    # .. without selecting much more than box's surroundings.
+    assert len(haloSiteIndices) < 200
+
+def test_select_halo_sites_min_sites():
+    sites = np.array(((0.1, 0.1), (0.9, 0.1), (0.5, 0.9), (0.5, 0.5)))
+    haloSiteIndices = selectHaloSites(sites = sites, box = tuple((0.49, 0.49, 0.51, 0.51)), minSites = 3)
+
+    assert len(haloSiteIndices) >= 3
+
+def test_select_periodic_halo_sites():
+    rng = np.random.default_rng(seed = 34)
+    sites = rng.random((2000, 2))
+
+    (haloSiteIndices, haloShifts) = selectPeriodicHaloSites(sites = sites)
+    selectedSites = np.concatenate((sites, sites[haloSiteIndices] + haloShifts))
+
+    # Every point in the unit square must have its nearest image among the selected ones..
+    shifts = np.array(tuple(((shiftX, shiftY) for shiftX in (-1, 0, 1) for shiftY in (-1, 0, 1))))
+    tiledSites = (sites[None, :, :] + shifts[:, None, :]).reshape(-1, 2)
+
+    squareSamples = rng.random((20000, 2))
+    (tiledDistances, _) = cKDTree(tiledSites).query(squareSamples)
+    (selectedDistances, _) = cKDTree(selectedSites).query(squareSamples)
+    assert np.allclose(tiledDistances, selectedDistances)
+
+    # .. while only copying the sites near its edges.
+    assert len(haloSiteIndices) < len(sites) / 2
\ No newline at end of file
@@ -0,0 +1,45 @@
+from ..RidgeClipping import clipRidgesToBox
+
+import numpy as np
+
+unitBox = np.array((0, 0, 1, 1))
+
+# Two sites either side of x = 0.5, so their ridge is vertical.
+sites = np.array(((0.25, 0.5), (0.75, 0.5), (0.5, -5)))
+center = sites.mean(axis = 0)
+
+def test_clip_ridge_crossing_box():
+    vertices = np.array(((0.5, 0.5), (0.5, 1.5)))
+    (vertex0s, vertex1s, vertex0sClipped, vertex1sClipped, ridgesInBox) = clipRidgesToBox(sites = sites, vertices = vertices, ridgePoints = ((0, 1),), ridgeVertices = ((0, 1),), box = unitBox, center = center)
+
+    assert ridgesInBox[0]
+    np.testing.assert_allclose(vertex0s[0], (0.5, 0.5))
+    np.testing.assert_allclose(vertex1s[0], (0.5, 1))
+
+    assert not vertex0sClipped[0]
+    assert vertex1sClipped[0]
+
+def test_clip_ridge_outside_box():
+    vertices = np.array(((0.5, 1.5), (0.5, 2.5)))
+    (_, _, _, _, ridgesInBox) = clipRidgesToBox(sites = sites, vertices = vertices, ridgePoints = ((0, 1),), ridgeVertices = ((0, 1),), box = unitBox, center = center)
+
+    assert not ridgesInBox[0]
+
+def test_clip_infinite_ridge():
+    # The ray runs from (0.5, 0.5) away from center - which is below it - so it leaves through the top.
+    vertices = np.array(((0.5, 0.5),))
+    (vertex0s, vertex1s, vertex0sClipped, vertex1sClipped, ridgesInBox) = clipRidgesToBox(sites = sites, vertices = vertices, ridgePoints = ((0, 1),), ridgeVertices = ((-1, 0),), box = unitBox, center = center)
+
+    assert ridgesInBox[0]
+    np.testing.assert_allclose(vertex0s[0], (0.5, 1))
+    np.testing.assert_allclose(vertex1s[0], (0.5, 0.5))
+
+    assert vertex0sClipped[0]
+    assert not vertex1sClipped[0]
+
+def test_clip_ridges_per_ridge_boxes():
+    vertices = np.array(((0.5, 0.5), (0.5, 1.5)))
+    boxes = np.array(((0, 0, 1, 1), (0, 2, 1, 3)))
+    (_, _, _, _, ridgesInBox) = clipRidgesToBox(sites = sites, vertices = vertices, ridgePoints = ((0, 1), (0, 1)), ridgeVertices = ((0, 1), (0, 1)), box = boxes, center = center)
+
+    np.testing.assert_array_equal(ridgesInBox, (True, False))
\ No newline at end of file